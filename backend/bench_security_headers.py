@@ -0,0 +1,112 @@
+"""
+Micro-benchmark: per-request cost of SecurityHeadersMiddleware
+
+Compares the pure ASGI middleware with the previous BaseHTTPMiddleware
+version (reproduced below) on a trivial JSON route and a streaming route.
+Requests are driven straight through the ASGI interface, so the numbers are
+middleware and framework overhead only, with no sockets involved.
+
+    python bench_security_headers.py [requests]
+"""
+import sys
+import time
+import asyncio
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from middleware import SecurityHeadersMiddleware, SECURITY_HEADERS
+
+
+class BaseHTTPSecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The middleware as it was before the pure ASGI rewrite"""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS.items():
+            response.headers[name] = value
+        return response
+
+
+def build_app(middleware=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(10):
+                yield b"x" * 1024
+        return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def request(app, path: str) -> dict:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1234), "server": ("bench", 80)
+    }
+    messages = iter([{"type": "http.request", "body": b"", "more_body": False}])
+    start = {}
+
+    async def receive():
+        try:
+            return next(messages)
+        except StopIteration:
+            # Starlette may keep listening for a disconnect after the body is read
+            await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            start.update(message)
+
+    await app(scope, receive, send)
+    return start
+
+
+async def bench(app, path: str, n: int) -> float:
+    """Mean microseconds per request"""
+    for _ in range(200):
+        await request(app, path)
+    started = time.perf_counter()
+    for _ in range(n):
+        await request(app, path)
+    return (time.perf_counter() - started) / n * 1e6
+
+
+async def main(n: int) -> None:
+    apps = {
+        "no middleware": build_app(),
+        "BaseHTTPMiddleware": build_app(BaseHTTPSecurityHeadersMiddleware),
+        "pure ASGI": build_app(SecurityHeadersMiddleware),
+    }
+
+    # Both versions must produce the same headers
+    expected = {(name.lower().encode(), value.encode()) for name, value in SECURITY_HEADERS.items()}
+    for label in ("BaseHTTPMiddleware", "pure ASGI"):
+        for path in ("/ping", "/stream"):
+            headers = set((await request(apps[label], path))["headers"])
+            assert expected <= headers, f"{label} {path} is missing security headers"
+
+    print(f"{n} requests per case, mean microseconds per request\n")
+    print(f"{'middleware':<22}{'/ping':>10}{'/stream':>10}")
+    results = {}
+    for label, app in apps.items():
+        results[label] = (await bench(app, "/ping", n), await bench(app, "/stream", n))
+        print(f"{label:<22}{results[label][0]:>10.1f}{results[label][1]:>10.1f}")
+
+    base = results["no middleware"]
+    print()
+    for label in ("BaseHTTPMiddleware", "pure ASGI"):
+        overhead = [results[label][i] - base[i] for i in range(2)]
+        print(f"{label} overhead: /ping {overhead[0]:+.1f} us, /stream {overhead[1]:+.1f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -29,7 +29,8 @@ CREATE TABLE profiles (
 CREATE TABLE hobbies (
   hobby_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
   profile_id UUID REFERENCES profiles(profile_id) ON DELETE CASCADE,
-  hobby_name VARCHAR(255) NOT NULL
+  hobby_name VARCHAR(255) NOT NULL,
+  UNIQUE (profile_id, hobby_name)
 );
 
 -- Relationships Table
@@ -108,7 +109,7 @@ CREATE TABLE date_plan_details (
 -- UserPreferences Table
 CREATE TABLE user_preferences (
   preference_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-  user_id UUID REFERENCES users(user_id) ON DELETE CASCADE,
+  user_id UUID UNIQUE REFERENCES users(user_id) ON DELETE CASCADE,
   dietary_needs JSONB DEFAULT '[]'::JSONB,
   transit_preferences JSONB DEFAULT '[]'::JSONB,
   budget_preference VARCHAR(50) DEFAULT 'medium',
@@ -176,3 +177,7 @@ CREATE POLICY "Users can view their own profiles" ON profiles FOR SELECT
   USING (auth.uid() = user_id);
 
 -- Note: Additional policies should be created for each table as needed
+
+-- Upsert conflict targets, for databases created before they were added:
+-- ALTER TABLE user_preferences ADD CONSTRAINT user_preferences_user_id_key UNIQUE (user_id);
+-- ALTER TABLE hobbies ADD CONSTRAINT hobbies_profile_id_hobby_name_key UNIQUE (profile_id, hobby_name);
@@ -2,19 +2,52 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse
-import os
+from contextlib import asynccontextmanager
 from routes.date_routes import router as date_router
 from routes.auth_routes import router as auth_router
 from routes.external_api_routes import router as external_api_router
 from middleware import SecurityHeadersMiddleware
+from utils.http_client import start_http_client, close_http_client
+from utils.supabase import close_supabase
+from utils.key_set import close_key_sets
+from utils.hashing import password_hasher
+from services.logic.cache_warmer import cache_warmer
+from services.logic.event_sync import event_sync
+from services.providers.event_store import aget_event_store
+from utils.config import get_settings
+
+settings = get_settings()
 
 # Get frontend URL from environment variables
-FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
+FRONTEND_URL = settings.frontend_url
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP client shared by every provider for the app's lifetime
+    app.state.http_client = await start_http_client()
+    # Keep provider caches warm for the hottest cities
+    cache_warmer.start()
+    # Open the local event store (SQLite schema setup) off the loop, before the first request.
+    # Events fall back to the live APIs if it cannot be opened (e.g. a read-only deploy).
+    try:
+        await aget_event_store()
+    except Exception as e:
+        print(f"[Event Store ERROR] Could not open the local event store: {e}")
+    # Mirror Ticketmaster events for configured and hot cities into the local store
+    event_sync.start()
+    yield
+    await event_sync.stop()
+    await cache_warmer.stop()
+    await close_key_sets()
+    await close_supabase()
+    await close_http_client()
+    password_hasher.close()
 
 app = FastAPI(
     title="LoveLink '89 API",
     description="Romantic Date Generator with API-first flow",
-    version="2.0"
+    version="2.0",
+    lifespan=lifespan
 )
 
 # Configure CORS - include all necessary origins
@@ -27,7 +60,7 @@ origins = [
     "https://09e0-2601-c2-1f00-f180-f0bd-5094-64f8-f051.ngrok-free.app",
     "https://sensible-deeply-ray.ngrok-free.app",
     # Add your Supabase URL if needed for authentication redirects
-    os.getenv("SUPABASE_URL", "")
+    settings.supabase_url or ""
 ]
 
 app.add_middleware(
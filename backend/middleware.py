@@ -1,13 +1,38 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Add security headers to allow Google Sign-In to work properly
-        response.headers["Cross-Origin-Opener-Policy"] = "unsafe-none"
-        response.headers["Cross-Origin-Embedder-Policy"] = "unsafe-none"
-        
-        return response
+from typing import Dict, Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Added to every HTTP response; COOP/COEP are relaxed so Google Sign-In popups work
+SECURITY_HEADERS = {
+    "Cross-Origin-Opener-Policy": "unsafe-none",
+    "Cross-Origin-Embedder-Policy": "unsafe-none",
+}
+
+
+class SecurityHeadersMiddleware:
+    """
+    Pure ASGI middleware that sets security headers on every HTTP response
+
+    Headers are written straight into the http.response.start message, so
+    there is no per-request task or body stream as with BaseHTTPMiddleware,
+    and streaming responses pass through untouched. A header the route
+    already set is replaced.
+    """
+
+    def __init__(self, app: ASGIApp, headers: Optional[Dict[str, str]] = None):
+        self.app = app
+        headers = SECURITY_HEADERS if headers is None else headers
+        self.headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+        self.names = {name for name, _ in self.headers}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                raw = [header for header in message.get("headers", []) if header[0].lower() not in self.names]
+                message["headers"] = raw + self.headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -6,9 +6,9 @@ import json
 router = APIRouter()
 
 @router.post("/generate-date")
-def get_date_plan(data: DatePlanGenerationRequest):
+async def get_date_plan(data: DatePlanGenerationRequest):
     try:
-        result = generate_date_plan(data)
+        result = await generate_date_plan(data)
         return json.loads(result)
     except Exception as e:
         print(f"[ERROR] {e}")
@@ -3,15 +3,18 @@ from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 from typing import Optional, Dict, Any
 import uuid
-import os
 
 from schemas.user_schemas import UserCreate, UserLogin, Token, User, ProfileCreate
 from utils.supabase import (
     sign_up, sign_in, sign_out,
     get_user, update_user, delete_user, get_all_users,
     save_user_preferences, get_user_preferences,
-    save_favorite_date, remove_favorite_date, get_favorite_dates
+    save_favorite_date, remove_favorite_date, get_favorite_dates,
+    get_user_context, get_request_loaders, RequestLoaders
 )
+from utils.auth import get_current_user, require_admin, auth_cache_stats
+from utils.hashing import password_hasher
+from utils.config import get_settings
 
 router = APIRouter()
 
@@ -19,8 +22,8 @@ router = APIRouter()
 async def get_supabase_config():
     """Provide Supabase configuration to the frontend"""
     return {
-        "url": os.getenv("SUPABASE_URL", ""),
-        "key": os.getenv("SUPABASE_KEY", "")
+        "url": get_settings().supabase_url or "",
+        "key": get_settings().supabase_key or ""
     }
 
 
@@ -89,3 +92,42 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         "user_id": user_id,
         "username": user_profile.get("username", "")
     }
+
+
+@router.get("/users/{user_id}/context")
+async def user_context(
+    user_id: str,
+    loaders: RequestLoaders = Depends(get_request_loaders),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """User, profile with hobbies, relationships and preferences in one lookup (own user only)"""
+    if str(current_user.get("user_id")) != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to read another user's context"
+        )
+    
+    result = await get_user_context(user_id, loaders)
+    
+    if "error" in result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND if result["error"] == "User not found" else status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=result["error"]
+        )
+    
+    return result
+
+@router.get("/me")
+async def me(current_user: Dict[str, Any] = Depends(get_current_user)):
+    """The signed-in user, resolved from a locally verified Supabase token"""
+    return current_user
+
+@router.get("/cache-stats", dependencies=[Depends(require_admin)])
+def auth_cache_stats_route():
+    """Token claims cache, profile cache and signing key counters"""
+    return auth_cache_stats()
+
+@router.get("/hashing-stats", dependencies=[Depends(require_admin)])
+def hashing_stats():
+    """Password hashing pool load, rejections and latency"""
+    return password_hasher.stats()
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from schemas.request_schemas import DatePlanGenerationRequest
-from services.logic.suggestion_engine import suggest_plan
+from services.logic.suggestion_engine import suggest_plan_async, stream_plan
 import json
 import time
 
@@ -11,26 +12,28 @@ def debug():
     """Debug endpoint to check if the API is working"""
     return {"status": "success", "message": "Date planning API is working"}
 
+def apply_request_defaults(request: DatePlanGenerationRequest):
+    """Ensure all required fields have default values to prevent 422 errors"""
+    if not request.dietary_restrictions:
+        request.dietary_restrictions = []
+    if not request.preferences:
+        request.preferences = []
+    if not request.interests:
+        request.interests = ["food", "entertainment"]
+    if not request.vibe:
+        request.vibe = "romantic"
+
 @router.post("/generate-date")
-def generate_date(request: DatePlanGenerationRequest):
+async def generate_date(request: DatePlanGenerationRequest):
     """Generate a date plan based on user preferences"""
     try:
         print(f"Received date plan request: {request}")
-        
-        # Ensure all required fields have default values to prevent 422 errors
-        if not request.dietary_restrictions:
-            request.dietary_restrictions = []
-        if not request.preferences:
-            request.preferences = []
-        if not request.interests:
-            request.interests = ["food", "entertainment"]
-        if not request.vibe:
-            request.vibe = "romantic"
+        apply_request_defaults(request)
         
         # Try to use the suggestion engine, but fall back to mock data if it fails
         try:
-            # Force the use of real APIs by setting a longer timeout
-            result = suggest_plan(request)
+            # Query all providers concurrently under one shared deadline
+            result = await suggest_plan_async(request)
             print("Successfully generated date plan using suggestion engine")
             return result
         except Exception as e:
@@ -93,4 +96,30 @@ def generate_date(request: DatePlanGenerationRequest):
             return mock_result
     except Exception as e:
         print(f"[ERROR] {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/generate-date/stream")
+async def generate_date_stream(request: DatePlanGenerationRequest):
+    """
+    Generate a date plan as Server-Sent Events
+
+    Emits "restaurants", "activities" and "events" as soon as each provider
+    answers, followed by a final "plan" event with the complete plan (the
+    same payload /generate-date returns).
+    """
+    print(f"Received streaming date plan request: {request}")
+    apply_request_defaults(request)
+
+    async def event_stream():
+        async for event, payload in stream_plan(request):
+            yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop reverse proxies from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
-from services.providers.places import get_nearby_places, get_nearby_foods
+from services.providers.places import get_nearby_places, get_nearby_foods, places_cache, venue_index
 from services.providers.ticketmaster import get_upcoming_events
+from utils.circuit_breaker import breaker_states
+from services.logic.cache_warmer import cache_warmer
+from services.logic.event_sync import event_sync
+from utils.auth import require_admin
 
 router = APIRouter()
 
@@ -22,7 +26,7 @@ class EventsSearchRequest(BaseModel):
     interests: Optional[List[str]] = []
 
 @router.post("/places/search")
-def search_places(request: PlacesSearchRequest):
+async def search_places(request: PlacesSearchRequest):
     """
     Search for places using Google Maps API
     """
@@ -32,13 +36,13 @@ def search_places(request: PlacesSearchRequest):
         # Use the existing places provider
         if request.query and request.query.lower() == "restaurants":
             # If specifically looking for restaurants
-            results = get_nearby_foods(
+            results = await get_nearby_foods(
                 location=request.location, 
                 dietary_restrictions=request.interests
             )
         else:
             # For other place types
-            results = get_nearby_places(
+            results = await get_nearby_places(
                 location=request.location,
                 interests=request.interests or [request.type] if request.type else ["attractions"]
             )
@@ -49,7 +53,7 @@ def search_places(request: PlacesSearchRequest):
         raise HTTPException(status_code=500, detail=f"Error searching places: {str(e)}")
 
 @router.post("/events/search")
-def search_events(request: EventsSearchRequest):
+async def search_events(request: EventsSearchRequest):
     """
     Search for events using Ticketmaster API
     """
@@ -57,7 +61,7 @@ def search_events(request: EventsSearchRequest):
         print(f"Received events search request: {request}")
         
         # Use the existing ticketmaster provider
-        results = get_upcoming_events(
+        results = await get_upcoming_events(
             location=request.location,
             interests=request.interests or ([request.keyword] if request.keyword else [])
         )
@@ -66,3 +70,31 @@ def search_events(request: EventsSearchRequest):
     except Exception as e:
         print(f"Error in events search: {e}")
         raise HTTPException(status_code=500, detail=f"Error searching events: {str(e)}")
+
+@router.get("/places/cache-stats", dependencies=[Depends(require_admin)])
+def places_cache_stats():
+    """
+    Hit/miss/eviction counters for the Places text-search cache and venue index size
+    """
+    return {**places_cache.stats(), "venue_index": venue_index.stats()}
+
+@router.get("/providers/breakers", dependencies=[Depends(require_admin)])
+def provider_breakers():
+    """
+    Circuit breaker state for every upstream provider
+    """
+    return breaker_states()
+
+@router.get("/providers/cache-warmer", dependencies=[Depends(require_admin)])
+def cache_warmer_stats():
+    """
+    Hottest (location, search term) keys and cache warmer counters
+    """
+    return cache_warmer.stats()
+
+@router.get("/providers/event-sync", dependencies=[Depends(require_admin)])
+def event_sync_stats():
+    """
+    Cities mirrored into the local event store and sync counters
+    """
+    return event_sync.stats()
@@ -1,9 +1,24 @@
-from utils.gemini import generate_gemini_response
+from utils.gemini import generate_gemini_response_async
 from utils.weather import get_weather_and_pollen
+from utils.prompt_cache import canonical_request_key, get_or_generate
 import re
 
-def generate_date_plan(data):
-    weather_summary = get_weather_and_pollen(data.location)
+async def generate_date_plan(data):
+    # Popular (location, budget, interests, vibe) combinations are served from cache
+    cache_key = canonical_request_key(
+        "date_plan",
+        location=data.location,
+        budget=data.budget,
+        interests=data.interests,
+        vibe=data.vibe
+    )
+    try:
+        return await get_or_generate(cache_key, lambda: request_date_plan(data))
+    except ValueError:
+        return '{ "error": "Gemini did not return JSON as expected." }'
+
+async def request_date_plan(data):
+    weather_summary = await get_weather_and_pollen(data.location)
 
     prompt = f"""
 You are a romantic AI concierge. Respond ONLY in valid JSON format.
@@ -58,11 +73,11 @@ Respond in this exact JSON format:
 }}
 """
 
-    response = generate_gemini_response(prompt)
+    response = await generate_gemini_response_async(prompt)
 
     # Try to extract only the JSON block
     match = re.search(r'{.*}', response, re.DOTALL)
     if match:
         return match.group()
-    else:
-        return '{ "error": "Gemini did not return JSON as expected." }'
\ No newline at end of file
+    # Raised rather than returned so a malformed answer is never cached
+    raise ValueError("Gemini did not return JSON as expected.")
\ No newline at end of file
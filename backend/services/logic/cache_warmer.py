@@ -0,0 +1,194 @@
+import asyncio
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+from services.providers.places import text_search, text_search_expires_in, food_search_term
+from utils.cache import normalize_key
+from utils.geocode import cached_geocode
+from utils.http_client import get_http_client
+from utils.config import get_settings
+
+settings = get_settings()
+
+# Number of hottest (location, search term) keys kept warm
+CACHE_WARMER_TOP_K = settings.cache_warmer_top_k
+# Seconds between warming passes
+CACHE_WARMER_INTERVAL = settings.cache_warmer_interval
+# Refresh entries that expire within this many seconds
+CACHE_WARMER_REFRESH_AHEAD = settings.cache_warmer_refresh_ahead
+# Maximum outbound requests the warmer may make per minute
+CACHE_WARMER_BUDGET_PER_MINUTE = settings.cache_warmer_budget_per_minute
+# Counts are halved this often (seconds) so yesterday's hot cities cool off
+CACHE_WARMER_DECAY_INTERVAL = settings.cache_warmer_decay_interval
+
+
+class CountMinSketch:
+    """Fixed-size frequency estimator; estimates never undercount"""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, key: Hashable):
+        return [hash((seed, key)) % self.width for seed in range(self.depth)]
+
+    def add(self, key: Hashable, count: int = 1) -> int:
+        """Count key and return its new estimated frequency"""
+        estimate = None
+        for row, index in zip(self.rows, self._indexes(key)):
+            row[index] += count
+            estimate = row[index] if estimate is None else min(estimate, row[index])
+        return estimate
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+    def decay(self) -> None:
+        """Halve every counter"""
+        for row in self.rows:
+            for i, value in enumerate(row):
+                row[i] = value >> 1
+
+
+class HeavyHitters:
+    """Approximate top-k keys by frequency, backed by a count-min sketch"""
+
+    def __init__(self, k: int, sketch: Optional[CountMinSketch] = None):
+        self.k = k
+        self.sketch = sketch or CountMinSketch()
+        self.top: Dict[Hashable, int] = {}
+
+    def add(self, key: Hashable) -> None:
+        estimate = self.sketch.add(key)
+        if key in self.top or len(self.top) < self.k:
+            self.top[key] = estimate
+            return
+
+        coldest = min(self.top, key=self.top.get)
+        if estimate > self.top[coldest]:
+            del self.top[coldest]
+            self.top[key] = estimate
+
+    def most_common(self) -> List[Tuple[Hashable, int]]:
+        return sorted(self.top.items(), key=lambda item: item[1], reverse=True)
+
+    def decay(self) -> None:
+        self.sketch.decay()
+        self.top = {key: count >> 1 for key, count in self.top.items() if count >> 1 > 0}
+
+
+class RequestBudget:
+    """Token bucket limiting outbound requests per minute"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def take(self, cost: int = 1) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+
+class CacheWarmer:
+    """
+    Keeps provider caches warm for the hottest (location, search term) keys
+
+    suggest_plan_async records every request's keys; a background task periodically
+    refreshes the top-k Places text searches that are missing or about to
+    expire, without exceeding the outbound request budget.
+    """
+
+    def __init__(
+        self,
+        top_k: int = CACHE_WARMER_TOP_K,
+        interval: float = CACHE_WARMER_INTERVAL,
+        refresh_ahead: float = CACHE_WARMER_REFRESH_AHEAD,
+        budget_per_minute: int = CACHE_WARMER_BUDGET_PER_MINUTE,
+        decay_interval: float = CACHE_WARMER_DECAY_INTERVAL
+    ):
+        self.hot_keys = HeavyHitters(top_k)
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.budget = RequestBudget(budget_per_minute)
+        self.decay_interval = decay_interval
+        self.refreshed = 0
+        self.skipped_for_budget = 0
+        self._last_decay = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, location: str, interests: list, dietary_restrictions: list) -> None:
+        """Count the Places searches a suggest_plan_async request makes"""
+        location = normalize_key(location)
+        if not location:
+            return
+        for interest in interests or []:
+            self.hot_keys.add((location, normalize_key(interest)))
+        self.hot_keys.add((location, normalize_key(food_search_term(dietary_restrictions))))
+
+    async def warm_once(self) -> int:
+        """Refresh hot keys that are missing or expiring soon; returns upstream calls made"""
+        if time.monotonic() - self._last_decay >= self.decay_interval:
+            self.hot_keys.decay()
+            self._last_decay = time.monotonic()
+
+        client = get_http_client()
+        calls = 0
+        for (location, term), _ in self.hot_keys.most_common():
+            try:
+                remaining = await text_search_expires_in(term, location)
+                if remaining is not None and remaining > self.refresh_ahead:
+                    continue
+                # The refresh geocodes the location first unless its coordinates are cached
+                geocoded, _ = await cached_geocode(location)
+                cost = 1 if geocoded else 2
+                if not self.budget.take(cost):
+                    self.skipped_for_budget += 1
+                    break
+                await text_search(term, location, client, refresh=True)
+                calls += cost
+                self.refreshed += 1
+            except Exception as e:
+                print(f"[Cache Warmer] Failed to refresh '{term}' in {location}: {e}")
+        return calls
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.warm_once()
+            except Exception as e:
+                print(f"[Cache Warmer ERROR] {e}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "hot_keys": [
+                {"location": location, "term": term, "estimated_requests": count}
+                for (location, term), count in self.hot_keys.most_common()
+            ],
+            "refreshed": self.refreshed,
+            "skipped_for_budget": self.skipped_for_budget,
+            "budget_per_minute": self.budget.capacity
+        }
+
+
+cache_warmer = CacheWarmer()
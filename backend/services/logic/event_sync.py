@@ -0,0 +1,104 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+from services.providers.ticketmaster import sync_city_events, TICKETMASTER_API_KEY
+from services.providers.event_store import aget_event_store, city_key, EVENT_STORE_MAX_AGE
+from services.logic.cache_warmer import cache_warmer
+from utils.http_client import get_http_client
+from utils.config import get_settings
+
+settings = get_settings()
+
+# Cities always kept in the local event store, as comma-separated city names ("Austin,Denver,New York")
+TICKETMASTER_SYNC_CITIES = list(settings.ticketmaster_sync_cities)
+# Seconds between sync passes
+TICKETMASTER_SYNC_INTERVAL = settings.ticketmaster_sync_interval
+# Maximum cities synced per pass (configured cities first, then the hottest requested ones)
+TICKETMASTER_SYNC_MAX_CITIES = settings.ticketmaster_sync_max_cities
+
+
+class EventSync:
+    """
+    Periodically mirrors upcoming Ticketmaster events into the local event store
+
+    Each pass syncs the configured cities plus the cities users ask about most
+    (from the cache warmer's heavy hitters). While a city is fresh in the store,
+    get_upcoming_events answers from SQLite without calling Ticketmaster.
+    """
+
+    def __init__(
+        self,
+        cities: Optional[List[str]] = None,
+        interval: float = TICKETMASTER_SYNC_INTERVAL,
+        max_cities: int = TICKETMASTER_SYNC_MAX_CITIES
+    ):
+        self.cities = TICKETMASTER_SYNC_CITIES if cities is None else cities
+        self.interval = interval
+        self.max_cities = max_cities
+        self.synced: Dict[str, Dict] = {}
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def cities_to_sync(self) -> List[str]:
+        """Configured cities followed by the hottest requested ones, deduplicated by city key"""
+        cities = {}
+        candidates = list(self.cities) + [location for (location, _), _ in cache_warmer.hot_keys.most_common()]
+        for location in candidates:
+            key = city_key(location)
+            if key and key not in cities:
+                cities[key] = location.strip()
+        return list(cities.values())[:self.max_cities]
+
+    async def sync_once(self) -> int:
+        """Sync every city that is not fresh enough to last until the next pass; returns cities synced"""
+        if not TICKETMASTER_API_KEY:
+            return 0
+
+        store = await aget_event_store()
+        client = get_http_client()
+        # Re-sync a city if it would go stale before the next pass runs
+        max_age = max(0.0, EVENT_STORE_MAX_AGE - self.interval)
+        synced = 0
+        for city in self.cities_to_sync():
+            try:
+                if await store.ais_fresh(city_key(city), max_age):
+                    continue
+                count = await sync_city_events(city, client)
+                self.synced[city_key(city)] = {"events": count, "synced_at": time.time()}
+                synced += 1
+            except Exception as e:
+                self.failures += 1
+                print(f"[Event Sync] Failed to sync {city}: {e}")
+        return synced
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.sync_once()
+            except Exception as e:
+                print(f"[Event Sync ERROR] {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "cities": self.cities_to_sync(),
+            "synced": self.synced,
+            "failures": self.failures,
+            "interval": self.interval
+        }
+
+
+event_sync = EventSync()
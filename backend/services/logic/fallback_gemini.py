@@ -1,6 +1,14 @@
-from utils.gemini import generate_gemini_response
+import asyncio
+from utils.gemini import generate_gemini_response_async, GEMINI_TIMEOUT
+from utils.prompt_cache import canonical_request_key, get_or_generate
 
-def get_fallback_gemini_plan(request):
+async def get_fallback_gemini_plan(request, timeout: float = GEMINI_TIMEOUT):
+    """
+    Ask Gemini for a date plan and fashion advice concurrently
+
+    Both prompts share one deadline. If either misses it or fails, the other
+    is still returned, the missing field is None and "partial" is True.
+    """
     # Step 1: Romantic date plan
     plan_prompt = f"""
 Suggest a complete romantic date plan (activities, food, gift, surprise) for a couple.
@@ -13,7 +21,15 @@ Preferences: {request.preferences}
 
 Format the response in readable text. Mention food, activity, optional surprise/gift, and reason for each selection.
 """
-    date_plan = generate_gemini_response(plan_prompt)
+    plan_key = canonical_request_key(
+        "fallback_plan",
+        location=request.location,
+        budget=request.budget,
+        interests=request.interests,
+        vibe=request.vibe,
+        dietary_restrictions=request.dietary_restrictions,
+        preferences=request.preferences
+    )
 
     # Step 2: Fashion advice
     fashion_prompt = f"""
@@ -24,9 +40,38 @@ Weather and activities are not known, so give flexible ideas.
 
 Give one outfit idea for a woman, one for a man, and one gender-neutral option.
 """
-    fashion_advice = generate_gemini_response(fashion_prompt)
+    fashion_key = canonical_request_key(
+        "fashion",
+        location=request.location,
+        vibe=request.vibe,
+        style_preference=request.style_preference or "casual",
+        available_clothing=request.available_clothing
+    )
+
+    # Both prompts are independent, so dispatch them together
+    tasks = {
+        "gemini_fallback": asyncio.ensure_future(
+            get_or_generate(plan_key, lambda: generate_gemini_response_async(plan_prompt))
+        ),
+        "fashion_advice": asyncio.ensure_future(
+            get_or_generate(fashion_key, lambda: generate_gemini_response_async(fashion_prompt))
+        ),
+    }
+    done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    for task in pending:
+        task.cancel()
+
+    result = {"partial": False}
+    for name, task in tasks.items():
+        if task in pending:
+            print(f"[Fallback Gemini] {name} missed the {timeout}s deadline")
+            result[name] = None
+            result["partial"] = True
+        elif task.exception() is not None:
+            print(f"[Fallback Gemini] {name} failed: {task.exception()}")
+            result[name] = None
+            result["partial"] = True
+        else:
+            result[name] = task.result()
 
-    return {
-        "gemini_fallback": date_plan,
-        "fashion_advice": fashion_advice
-    }
\ No newline at end of file
+    return result
\ No newline at end of file
@@ -1,17 +1,13 @@
-def filter_options(options, preferences):
-    if not preferences:
-        return options
+# Preference flags a venue can satisfy, checked against the venue dict
+PREFERENCE_CHECKS = {
+    "walkable": lambda opt: bool(opt.get("walkable_from")),
+    "free_parking": lambda opt: "free" in (opt.get("parking_tip") or "").lower(),
+    "transit_friendly": lambda opt: bool(opt.get("transit_suggestion")),
+}
 
-    filtered = []
-    for opt in options:
-        score = 0
-        if "walkable" in preferences and opt.get("walkable_from"):
-            score += 1
-        if "free_parking" in preferences and "free" in opt.get("parking_tip", "").lower():
-            score += 1
-        if "transit_friendly" in preferences and opt.get("transit_suggestion"):
-            score += 1
-        if score > 0:
-            filtered.append(opt)
-
-    return filtered or options
\ No newline at end of file
+def preference_score(opt, preferences):
+    """Fraction of the requested preference flags that opt satisfies (1.0 when none are requested)"""
+    checks = [PREFERENCE_CHECKS[p] for p in preferences or [] if p in PREFERENCE_CHECKS]
+    if not checks:
+        return 1.0
+    return sum(1 for check in checks if check(opt)) / len(checks)
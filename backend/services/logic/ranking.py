@@ -0,0 +1,166 @@
+import os
+import json
+import re
+from typing import Any, Dict, List, Optional
+import numpy as np
+from utils.geo_index import haversine_m, METERS_PER_MILE
+from services.logic.preference_filter import preference_score
+from utils.config import get_settings
+
+# Per-vibe weight vectors and vibe keywords; point this at another file to retune ranking
+RANKING_WEIGHTS_PATH = get_settings().ranking_weights_path or (
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "ranking_weights.json")
+)
+
+# Columns of the feature matrix, each scaled to [0, 1]
+FEATURES = ["rating", "price_fit", "proximity", "dietary_match", "preference_match", "vibe_match"]
+
+# Value used when a candidate has no data for a feature
+NEUTRAL = 0.5
+
+# Budget options sent by the frontend, as a target Places price_level (0-4)
+BUDGET_PRICE_LEVELS = {"free": 0, "low": 1, "medium": 2, "high": 3, "luxury": 4}
+
+
+def budget_price_level(budget: Optional[str]) -> float:
+    """
+    Target Places price_level for a budget
+
+    Accepts the frontend options ("free" ... "luxury"), dollar signs ("$$")
+    or an amount per person ("$75").
+    """
+    budget = (budget or "").strip().lower()
+    if budget in BUDGET_PRICE_LEVELS:
+        return BUDGET_PRICE_LEVELS[budget]
+    if budget and set(budget) == {"$"}:
+        return min(len(budget), 4)
+    amount = re.search(r"\d+(\.\d+)?", budget)
+    if amount:
+        value = float(amount.group())
+        return 0 if value <= 0 else 1 if value < 25 else 2 if value < 50 else 3 if value < 100 else 4
+    return 2
+
+
+class Ranker:
+    """
+    Scores candidate venues with per-vibe weights in one vectorized pass
+
+    Each candidate becomes a row of the FEATURES matrix; the score is the
+    matrix times the weight vector for the request's vibe (the "default"
+    weights fill in anything a vibe does not override).
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        weights = config.get("weights", {})
+        default = weights.get("default", {})
+        self.weights: Dict[str, np.ndarray] = {}
+        for vibe, overrides in weights.items():
+            vector = np.array([float({**default, **overrides}.get(f, 0.0)) for f in FEATURES])
+            total = vector.sum()
+            self.weights[vibe] = vector / total if total > 0 else vector
+        self.vibe_keywords = {vibe: [k.lower() for k in keywords] for vibe, keywords in config.get("vibe_keywords", {}).items()}
+
+    def weights_for(self, vibe: Optional[str]) -> np.ndarray:
+        vibe = (vibe or "").lower()
+        if vibe in self.weights:
+            return self.weights[vibe]
+        return self.weights.get("default", np.full(len(FEATURES), 1.0 / len(FEATURES)))
+
+    def features(self, options: List[Dict[str, Any]], request, anchor: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """
+        Build the (candidates x FEATURES) matrix
+
+        Args:
+            options: Venue dicts from the providers
+            request: DatePlanGenerationRequest
+            anchor: Venue with lat/lng to measure proximity from (e.g. the
+                first activity); defaults to each venue's distance_m from
+                the searched location
+        """
+        n = len(options)
+
+        def column(values):
+            return np.fromiter((NEUTRAL if v is None else v for v in values), dtype=float, count=n)
+
+        rating = column(
+            float(o["rating"]) / 5.0 if isinstance(o.get("rating"), (int, float)) else None for o in options
+        )
+
+        target = budget_price_level(request.budget)
+        price_fit = column(
+            1.0 - abs(o["price_level"] - target) / 4.0 if isinstance(o.get("price_level"), (int, float)) else None
+            for o in options
+        )
+
+        if anchor is not None and anchor.get("lat") is not None and anchor.get("lng") is not None:
+            located = [i for i, o in enumerate(options) if o.get("lat") is not None and o.get("lng") is not None]
+            distances = np.full(n, np.nan)
+            if located:
+                distances[located] = haversine_m(
+                    anchor["lat"], anchor["lng"],
+                    [options[i]["lat"] for i in located], [options[i]["lng"] for i in located]
+                )
+        else:
+            distances = np.array([np.nan if o.get("distance_m") is None else o["distance_m"] for o in options], dtype=float)
+        # 1.0 on the spot, 0.5 at one mile
+        proximity = np.where(np.isnan(distances), NEUTRAL, 1.0 / (1.0 + np.nan_to_num(distances) / METERS_PER_MILE))
+
+        diets = [d.lower() for d in request.dietary_restrictions or []]
+        dietary_match = column(
+            None if not diets or o.get("dietary_friendly") is None
+            else float(any(d in str(o["dietary_friendly"]).lower() for d in diets))
+            for o in options
+        )
+
+        preference_match = column(preference_score(o, request.preferences) for o in options)
+
+        keywords = self.vibe_keywords.get((request.vibe or "").lower())
+        if keywords:
+            texts = (
+                " ".join([str(o.get("name", "")), str(o.get("type", "")), str(o.get("cuisine", ""))]
+                         + [str(tag) for tag in o.get("vibe") or []] + [str(tag) for tag in o.get("tags") or []]).lower()
+                for o in options
+            )
+            vibe_match = column(float(any(k in text for k in keywords)) for text in texts)
+        else:
+            vibe_match = np.full(n, NEUTRAL)
+
+        return np.column_stack([rating, price_fit, proximity, dietary_match, preference_match, vibe_match])
+
+    def rank(self, options: List[Dict[str, Any]], request, k: Optional[int] = None, anchor: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Best k options for request, highest score first
+
+        Only the top k are sorted (argpartition), so widening the candidate
+        pool stays cheap. Ties keep the providers' original order.
+        """
+        if not options:
+            return []
+        n = len(options)
+        k = n if k is None else max(0, min(k, n))
+        if k == 0:
+            return []
+
+        scores = self.features(options, request, anchor) @ self.weights_for(request.vibe)
+        # A negligible position penalty makes ties deterministic, earlier candidates first
+        scores -= np.arange(n) * 1e-9
+        top = np.arange(n) if k == n else np.argpartition(-scores, k - 1)[:k]
+        order = top[np.argsort(-scores[top])]
+        return [options[i] for i in order]
+
+
+_ranker: Optional[Ranker] = None
+
+
+def get_ranker() -> Ranker:
+    """Ranker built from RANKING_WEIGHTS_PATH on first use"""
+    global _ranker
+    if _ranker is None:
+        with open(RANKING_WEIGHTS_PATH, encoding="utf-8") as f:
+            _ranker = Ranker(json.load(f))
+    return _ranker
+
+
+def rank_options(options, request, k=None, anchor=None):
+    """Rank provider options for request (see Ranker.rank)"""
+    return get_ranker().rank(options, request, k=k, anchor=anchor)
@@ -0,0 +1,95 @@
+import os
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from utils.config import get_settings
+
+# Keyword table driving restaurant enrichment; point this at another file to extend it
+RESTAURANT_KEYWORDS_PATH = get_settings().restaurant_keywords_path or (
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "restaurant_keywords.json")
+)
+
+
+class RestaurantClassifier:
+    """
+    Single-pass keyword classifier for Places restaurant results
+
+    Every keyword in the table is compiled into one regex. Classifying a venue
+    scans its name and Places types once; each field then takes the value of
+    its highest-priority (earliest) matching rule, or the field's default.
+    Matching is case-insensitive and on whole words, allowing a plural "s"
+    or "es" ("tacos" matches "taco", "Tacoma" does not). A keyword phrase
+    that contains another keyword as a word (e.g. "indian restaurant" and
+    "indian" if both were listed) also triggers the shorter keyword's rules.
+    """
+
+    def __init__(self, table: Dict[str, Any]):
+        self.generic_types = set(table.get("generic_types", []))
+        self.defaults: Dict[str, Any] = {}
+        # keyword -> [(field, priority, value)]
+        actions: Dict[str, List[Tuple[str, int, Any]]] = {}
+
+        for field, spec in table["fields"].items():
+            self.defaults[field] = spec.get("default")
+            for priority, rule in enumerate(spec.get("rules", [])):
+                for keyword in rule["match"]:
+                    actions.setdefault(keyword.lower(), []).append((field, priority, rule["value"]))
+
+        # A match on a longer phrase hides shorter keywords starting at the same position
+        self.actions = {
+            keyword: [
+                action
+                for other, other_actions in actions.items() if re.search(r"\b" + re.escape(other) + r"\b", keyword)
+                for action in other_actions
+            ]
+            for keyword in actions
+        }
+        alternatives = sorted(self.actions, key=len, reverse=True)
+        # Only the whole-word match sits inside the lookahead, which tries every
+        # start position, so overlapping keyword phrases are all found
+        self.pattern = re.compile(
+            r"(?=\b(" + "|".join(re.escape(keyword) for keyword in alternatives) + r")(?:e?s)?\b)"
+        ) if alternatives else None
+
+    def classify_text(self, text: str) -> Dict[str, Any]:
+        """Field values for lowercase text"""
+        best: Dict[str, Tuple[int, Any]] = {}
+        if self.pattern is not None:
+            for keyword in {match.group(1) for match in self.pattern.finditer(text)}:
+                for field, priority, value in self.actions[keyword]:
+                    if field not in best or priority < best[field][0]:
+                        best[field] = (priority, value)
+        return {field: best[field][1] if field in best else default for field, default in self.defaults.items()}
+
+    def classify(self, place: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Classify one Places result
+
+        Args:
+            place: Raw Places result (uses "name" and "types")
+
+        Returns:
+            Mapping of every table field to its value; "cuisine" falls back to
+            the most specific Places type when no keyword matched
+        """
+        types = place.get("types") or []
+        text = " ".join([place.get("name", "")] + [t.replace("_", " ") for t in types]).lower()
+        fields = self.classify_text(text)
+
+        if fields.get("cuisine") is None:
+            specific = [t for t in types if t not in self.generic_types]
+            cuisine_type = (specific or types or ["restaurant"])[0]
+            fields["cuisine"] = cuisine_type.replace("_", " ").title()
+        return fields
+
+
+_classifier: Optional[RestaurantClassifier] = None
+
+
+def get_classifier() -> RestaurantClassifier:
+    """Classifier built from RESTAURANT_KEYWORDS_PATH on first use"""
+    global _classifier
+    if _classifier is None:
+        with open(RESTAURANT_KEYWORDS_PATH, encoding="utf-8") as f:
+            _classifier = RestaurantClassifier(json.load(f))
+    return _classifier
@@ -1,13 +1,26 @@
 from services.providers.events import get_upcoming_events
 from services.providers.places import get_nearby_places, get_nearby_foods
-from services.logic.preference_filter import filter_options
+from services.logic.ranking import rank_options
 from services.logic.fallback_gemini import get_fallback_gemini_plan
+from services.logic.cache_warmer import cache_warmer
+import asyncio
 import random
-import time
 
-def suggest_plan(request):
+# Shared deadline (seconds) for all provider lookups of a single plan
+PROVIDER_TIMEOUT = 10
+
+# Activities and restaurants shown per plan
+PLAN_OPTIONS = 2
+
+async def suggest_plan_async(request, timeout: float = PROVIDER_TIMEOUT):
     """
     Generate a date plan based on user preferences
+
+    All provider lookups are issued concurrently and share a single deadline,
+    so the response time is bounded by the slowest provider (or the deadline)
+    instead of the sum of every upstream round trip. Providers that miss the
+    deadline are cancelled and treated as having returned no results.
+
     Returns data in the format expected by the frontend:
     {
         "activities": [...],
@@ -17,91 +30,187 @@ def suggest_plan(request):
     """
     # Start with mock data as a fallback
     result = create_mock_data(request)
-    
+
     try:
-        # Set a timeout for real data fetching
-        start_time = time.time()
-        timeout = 10  # Increase timeout to 10 seconds
-        
-        # Try to get real data from providers with timeout check
-        try:
-            events = get_upcoming_events(request.location, request.interests)
-            # Check if we're approaching timeout
-            if time.time() - start_time > timeout:
-                raise TimeoutError("Events lookup timeout")
-                
-            places = get_nearby_places(request.location, request.interests)
-            # Check if we're approaching timeout
-            if time.time() - start_time > timeout:
-                raise TimeoutError("Places lookup timeout")
-                
-            foods = get_nearby_foods(request.location, request.dietary_restrictions)
-            
-            # Apply preference filters if we have time
-            if time.time() - start_time <= timeout:
-                places = filter_options(places, request.preferences)
-                foods = filter_options(foods, request.preferences)
-            
-            # If we have real data, convert it to the expected format
-            if places or foods:
-                # Reset result to empty structure
-                result = {
-                    "activities": [],
-                    "restaurants": [],
-                    "surprise": result["surprise"]  # Keep the surprise from mock data
-                }
-                
-                # Map places to activities (up to 2)
-                for i, place in enumerate(places[:2]):
-                    result["activities"].append({
-                        "id": i + 1,
-                        "name": place.get("name", f"Activity in {request.location}"),
-                        "image": "https://images.unsplash.com/photo-1511882150382-421056c89033",
-                        "type": place.get("type", "Entertainment"),
-                        "tags": [place.get("type", "Fun"), "Local"],
-                        "description": f"Enjoy this local activity in {request.location}"
-                    })
-                
-                # Map foods to restaurants (up to 2)
-                for i, food in enumerate(foods[:2]):
-                    result["restaurants"].append({
-                        "id": i + 1,
-                        "name": food.get("name", f"Restaurant in {request.location}"),
-                        "image": food.get("image", "https://images.unsplash.com/photo-1555126634-323283e090fa"),
-                        "cuisine": food.get("cuisine", "Local"),
-                        "rating": food.get("rating", 4.5),
-                        "distance": food.get("distance", "1.2 miles from center"),
-                        "vibe": food.get("vibe", ["Cozy", "Friendly"]),
-                        "dietary_friendly": food.get("dietary_friendly", "Various options"),
-                        "things_to_order": food.get("things_to_order", "Chef's choice"),
-                        "price_level": food.get("price_level", 2),
-                        "budget_range": food.get("budget_range", "$$")
-                    })
-        except Exception as e:
-            print(f"Error fetching real data: {e}")
-            # We'll use the mock data initialized at the beginning
-            pass
-            
-        # Ensure we have at least 2 activities and 2 restaurants
-        if len(result["activities"]) < 2:
-            mock_data = create_mock_data(request)
-            # Add missing activities from mock data
-            for i in range(len(result["activities"]), 2):
-                result["activities"].append(mock_data["activities"][i])
-                
-        if len(result["restaurants"]) < 2:
-            mock_data = create_mock_data(request)
-            # Add missing restaurants from mock data
-            for i in range(len(result["restaurants"]), 2):
-                result["restaurants"].append(mock_data["restaurants"][i])
-        
-        return result
-    
+        provider_results = await gather_with_deadline(provider_lookups(request), timeout)
+
+        result = build_plan(request, provider_results["places"], provider_results["foods"], result)
+        return fill_missing_with_mock(request, result)
+
     except Exception as e:
         print(f"Error in suggestion engine: {e}")
         # Return mock data if anything fails
         return create_mock_data(request)
 
+def suggest_plan(request):
+    """Blocking variant of suggest_plan_async for scripts; never call this from the event loop"""
+    return asyncio.run(suggest_plan_async(request))
+
+async def stream_plan(request, timeout: float = PROVIDER_TIMEOUT):
+    """
+    Generate a date plan progressively
+
+    Yields (event, payload) pairs as each provider finishes, fastest first:
+    "restaurants" and "activities" carry the formatted cards for that
+    provider, "events" carries the upcoming events. A final "plan" event
+    carries the complete plan in the same format as suggest_plan_async.
+    """
+    fallback = create_mock_data(request)
+    provider_results = {"events": [], "places": [], "foods": []}
+    ranked_places = None
+    # Restaurants that arrived before the activities they are ranked against
+    waiting_foods = None
+
+    try:
+        async for name, items in iter_with_deadline(provider_lookups(request), timeout):
+            provider_results[name] = items
+            if name == "places":
+                ranked_places = rank_options(items, request, k=PLAN_OPTIONS)
+                yield "activities", format_activities(request, ranked_places)
+                if waiting_foods is not None:
+                    foods = rank_options(waiting_foods, request, k=PLAN_OPTIONS, anchor=walkable_anchor(request, ranked_places))
+                    yield "restaurants", format_restaurants(request, foods)
+                    waiting_foods = None
+            elif name == "foods":
+                if ranked_places is None and needs_anchor(request):
+                    waiting_foods = items
+                else:
+                    foods = rank_options(items, request, k=PLAN_OPTIONS, anchor=walkable_anchor(request, ranked_places))
+                    yield "restaurants", format_restaurants(request, foods)
+            else:
+                yield name, items
+
+        result = build_plan(request, provider_results["places"], provider_results["foods"], fallback)
+        yield "plan", fill_missing_with_mock(request, result)
+
+    except Exception as e:
+        print(f"Error in suggestion engine: {e}")
+        yield "plan", create_mock_data(request)
+
+def provider_lookups(request) -> dict:
+    """Provider coroutines needed for a plan, keyed by provider name"""
+    # Feed the cache warmer so the hottest cities stay cached
+    cache_warmer.record(request.location, request.interests, request.dietary_restrictions)
+    return {
+        "events": get_upcoming_events(request.location, request.interests),
+        "places": get_nearby_places(request.location, request.interests),
+        "foods": get_nearby_foods(request.location, request.dietary_restrictions),
+    }
+
+async def iter_with_deadline(lookups: dict, timeout: float):
+    """
+    Run named provider coroutines concurrently under one shared deadline,
+    yielding (name, results) in completion order.
+
+    Providers that fail yield []; providers still running at the deadline
+    are cancelled and yield [] after every finished provider.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    tasks = {asyncio.ensure_future(coro): name for name, coro in lookups.items()}
+    pending = set(tasks)
+
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                if task.exception() is not None:
+                    print(f"[Suggestion Engine] {name} lookup failed: {task.exception()}")
+                    yield name, []
+                else:
+                    yield name, task.result() or []
+    finally:
+        # Also runs when the consumer stops early (e.g. a streaming client disconnects)
+        for task in pending:
+            task.cancel()
+
+    for task in pending:
+        print(f"[Suggestion Engine] {tasks[task]} lookup missed the {timeout}s deadline")
+        yield tasks[task], []
+
+async def gather_with_deadline(lookups: dict, timeout: float) -> dict:
+    """
+    Run named provider coroutines concurrently under one shared deadline.
+
+    Args:
+        lookups: Mapping of provider name to coroutine
+        timeout: Deadline in seconds for all lookups together
+
+    Returns:
+        Mapping of provider name to its results ([] if it failed or timed out)
+    """
+    return {name: results async for name, results in iter_with_deadline(lookups, timeout)}
+
+def needs_anchor(request):
+    """Whether restaurants are ranked by distance from the first activity"""
+    return "walkable" in (request.preferences or [])
+
+def walkable_anchor(request, ranked_places):
+    """Venue restaurant proximity is measured from (None ranks by distance from the searched location)"""
+    # Walkable dates measure restaurant proximity from the first activity
+    return ranked_places[0] if ranked_places and needs_anchor(request) else None
+
+def build_plan(request, places, foods, fallback):
+    """Rank provider results and convert the best into the frontend plan format"""
+    if not (places or foods):
+        return fallback
+
+    places = rank_options(places, request, k=PLAN_OPTIONS)
+    foods = rank_options(foods, request, k=PLAN_OPTIONS, anchor=walkable_anchor(request, places))
+
+    return {
+        "activities": format_activities(request, places),
+        "restaurants": format_restaurants(request, foods),
+        "surprise": fallback["surprise"]  # Keep the surprise from mock data
+    }
+
+def format_activities(request, places):
+    """Map places to activity cards (up to PLAN_OPTIONS)"""
+    return [{
+        "id": i + 1,
+        "name": place.get("name", f"Activity in {request.location}"),
+        "image": "https://images.unsplash.com/photo-1511882150382-421056c89033",
+        "type": place.get("type", "Entertainment"),
+        "tags": [place.get("type", "Fun"), "Local"],
+        "description": f"Enjoy this local activity in {request.location}"
+    } for i, place in enumerate(places[:PLAN_OPTIONS])]
+
+def format_restaurants(request, foods):
+    """Map foods to restaurant cards (up to PLAN_OPTIONS)"""
+    return [{
+        "id": i + 1,
+        "name": food.get("name", f"Restaurant in {request.location}"),
+        "image": food.get("image", "https://images.unsplash.com/photo-1555126634-323283e090fa"),
+        "cuisine": food.get("cuisine", "Local"),
+        "rating": food.get("rating", 4.5),
+        "distance": food.get("distance", "1.2 miles from center"),
+        "vibe": food.get("vibe", ["Cozy", "Friendly"]),
+        "dietary_friendly": food.get("dietary_friendly", "Various options"),
+        "things_to_order": food.get("things_to_order", "Chef's choice"),
+        "price_level": food.get("price_level", 2),
+        "budget_range": food.get("budget_range", "$$")
+    } for i, food in enumerate(foods[:PLAN_OPTIONS])]
+
+def fill_missing_with_mock(request, result):
+    """Ensure we have at least 2 activities and 2 restaurants"""
+    if len(result["activities"]) < 2:
+        mock_data = create_mock_data(request)
+        # Add missing activities from mock data
+        for i in range(len(result["activities"]), 2):
+            result["activities"].append(mock_data["activities"][i])
+            
+    if len(result["restaurants"]) < 2:
+        mock_data = create_mock_data(request)
+        # Add missing restaurants from mock data
+        for i in range(len(result["restaurants"]), 2):
+            result["restaurants"].append(mock_data["restaurants"][i])
+
+    return result
+
 def create_mock_data(request):
     """Create mock data based on the request parameters"""
     return {
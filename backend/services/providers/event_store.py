@@ -0,0 +1,188 @@
+import os
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from utils.cache import normalize_key
+from utils.config import get_settings
+
+settings = get_settings()
+
+EVENT_STORE_PATH = settings.event_store_path or (
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "event_store.sqlite3")
+)
+
+# A city's local events are trusted for this long after its last sync (seconds)
+EVENT_STORE_MAX_AGE = settings.event_store_max_age
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS local_events (
+    event_id TEXT NOT NULL,
+    city TEXT NOT NULL,
+    starts_at TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    location TEXT,
+    event_date TEXT,
+    event_time TEXT,
+    price TEXT,
+    image_url TEXT,
+    external_link TEXT,
+    venue TEXT,
+    type TEXT,
+    -- The same event may be stored under several city keys ("austin" and "austin, tx")
+    PRIMARY KEY (city, event_id)
+);
+CREATE INDEX IF NOT EXISTS idx_local_events_city_start ON local_events (city, starts_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS local_events_fts USING fts5 (
+    event_id UNINDEXED,
+    city UNINDEXED,
+    keywords,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS synced_cities (
+    city TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL,
+    event_count INTEGER NOT NULL
+);
+"""
+
+
+def city_key(location: str) -> str:
+    """
+    Normalized location used to key the store ("Austin,  TX" -> "austin, tx")
+
+    The state or country is kept so "Portland, OR" and "Portland, ME" are
+    stored separately.
+    """
+    parts = [normalize_key(part) for part in (location or "").split(",")]
+    return ", ".join(part for part in parts if part)
+
+
+def fts_query(interests: List[str]) -> str:
+    """OR together the quoted words of each interest for an FTS5 MATCH"""
+    words = {word for interest in interests for word in re.findall(r"\w+", interest.lower())}
+    return " OR ".join(f'"{word}"' for word in sorted(words))
+
+
+class EventStore:
+    """
+    SQLite store of upcoming events, kept fresh by the background Ticketmaster sync
+
+    Rows follow the LocalEvent schema (name, description, location, event_date,
+    event_time, price, image_url, external_link) plus the city and start time
+    used for indexed lookups. Interest keywords are indexed with FTS5.
+    """
+
+    def __init__(self, path: str = EVENT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._drop_outdated_schema()
+            self._conn.executescript(SCHEMA)
+
+    def _drop_outdated_schema(self) -> None:
+        """Drop stores keyed by event_id alone; they are only a mirror and are re-synced"""
+        primary_key = [row["name"] for row in self._conn.execute("PRAGMA table_info(local_events)") if row["pk"]]
+        if primary_key == ["event_id"]:
+            self._conn.executescript(
+                "DROP TABLE local_events; DROP TABLE IF EXISTS local_events_fts; DROP TABLE IF EXISTS synced_cities;"
+            )
+
+    def replace_city_events(self, city: str, events: List[Dict]) -> None:
+        """
+        Replace every stored event for city with events
+
+        Each event is a LocalEvent-shaped dict with event_id, starts_at, venue,
+        type and keywords added.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM local_events WHERE city = ?", (city,))
+            self._conn.execute("DELETE FROM local_events_fts WHERE city = ?", (city,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO local_events (event_id, city, starts_at, name, description, location, "
+                "event_date, event_time, price, image_url, external_link, venue, type) "
+                "VALUES (:event_id, :city, :starts_at, :name, :description, :location, "
+                ":event_date, :event_time, :price, :image_url, :external_link, :venue, :type)",
+                [{**event, "city": city} for event in events]
+            )
+            self._conn.executemany(
+                "INSERT INTO local_events_fts (event_id, city, keywords) VALUES (?, ?, ?)",
+                [(event["event_id"], city, event["keywords"]) for event in events]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO synced_cities (city, synced_at, event_count) VALUES (?, ?, ?)",
+                (city, time.time(), len(events))
+            )
+
+    def is_fresh(self, city: str, max_age: float = EVENT_STORE_MAX_AGE) -> bool:
+        """Whether city has been synced within max_age seconds"""
+        with self._lock:
+            row = self._conn.execute("SELECT synced_at FROM synced_cities WHERE city = ?", (city,)).fetchone()
+        return row is not None and time.time() - row["synced_at"] <= max_age
+
+    def search(self, city: str, interests: List[str], days: int = 14, limit: int = 3) -> List[Dict]:
+        """
+        Upcoming events in city within the next days, soonest first
+
+        Events matching any interest keyword are returned; with no interests
+        every upcoming event qualifies.
+        """
+        now = datetime.utcnow()
+        start = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+        end = (now + timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        match = fts_query(interests or [])
+
+        if match:
+            sql = (
+                "SELECT e.* FROM local_events e "
+                "WHERE e.city = ? AND e.starts_at BETWEEN ? AND ? AND e.event_id IN ("
+                "SELECT event_id FROM local_events_fts WHERE local_events_fts MATCH ? AND city = ?) "
+                "ORDER BY e.starts_at LIMIT ?"
+            )
+            args = (city, start, end, match, city, limit)
+        else:
+            sql = (
+                "SELECT * FROM local_events WHERE city = ? AND starts_at BETWEEN ? AND ? "
+                "ORDER BY starts_at LIMIT ?"
+            )
+            args = (city, start, end, limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [dict(row) for row in rows]
+
+    async def asearch(self, city: str, interests: List[str], days: int = 14, limit: int = 3) -> List[Dict]:
+        return await asyncio.to_thread(self.search, city, interests, days, limit)
+
+    async def areplace_city_events(self, city: str, events: List[Dict]) -> None:
+        await asyncio.to_thread(self.replace_city_events, city, events)
+
+    async def ais_fresh(self, city: str, max_age: float = EVENT_STORE_MAX_AGE) -> bool:
+        return await asyncio.to_thread(self.is_fresh, city, max_age)
+
+
+_store: Optional[EventStore] = None
+_store_lock = threading.Lock()
+
+
+def get_event_store() -> EventStore:
+    """Shared store; opening it creates the schema, so call aget_event_store from the event loop"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = EventStore()
+    return _store
+
+
+async def aget_event_store() -> EventStore:
+    if _store is not None:
+        return _store
+    return await asyncio.to_thread(get_event_store)
@@ -1,40 +1,104 @@
-import os
+import asyncio
 import httpx
-from dotenv import load_dotenv
+from typing import Optional
 from datetime import datetime, timedelta
 from services.providers.ticketmaster import get_upcoming_events as get_ticketmaster_events
-from utils.gemini import generate_gemini_response
+from utils.gemini import generate_gemini_response_async
+from utils.http_client import get_http_client, raise_for_upstream_error
+from utils.circuit_breaker import get_breaker
+from utils.config import get_settings
 import json
 
-load_dotenv()
-EVENTBRITE_TOKEN = os.getenv("EVENTBRITE_OAUTH_TOKEN")
+settings = get_settings()
+EVENTBRITE_TOKEN = settings.eventbrite_token
 
-def get_upcoming_events(location: str, interests: list):
-    """Get upcoming events using Ticketmaster as primary source with fallbacks"""
-    
-    # First try: Ticketmaster API
-    events = get_ticketmaster_events(location, interests)
-    if events:
-        print(f"[Events INFO] Found {len(events)} events via Ticketmaster")
-        return events
-    
-    # Second try: Eventbrite API (kept as fallback)
-    events = get_eventbrite_events(location, interests)
-    if events:
-        print(f"[Events INFO] Found {len(events)} events via Eventbrite")
-        return events
-    
-    # Final fallback: Generate AI suggestions
-    events = generate_ai_event_suggestions(location, interests)
-    if events:
-        print(f"[Events INFO] Generated {len(events)} AI event suggestions")
-        return events
-    
-    # If all else fails, return empty list
-    return []
+eventbrite_breaker = get_breaker("eventbrite", slow_call_duration=4.0)
+
+# Seconds to wait on a source before starting the next one in parallel
+EVENTS_HEDGE_DELAY = settings.events_hedge_delay
+
+async def get_upcoming_events(
+    location: str,
+    interests: list,
+    client: Optional[httpx.AsyncClient] = None,
+    hedge_delay: Optional[float] = EVENTS_HEDGE_DELAY
+):
+    """
+    Get upcoming events using Ticketmaster as primary source with fallbacks
+
+    Sources are tried in order: Ticketmaster, Eventbrite, then AI suggestions.
+    In hedged mode (the default) a source that has not answered within
+    hedge_delay seconds gets the next source started alongside it, and the
+    first non-empty answer wins; a source that answers empty starts the next
+    one immediately. Losing calls are cancelled. Pass hedge_delay=None to
+    query the sources strictly one after another.
+    """
+    client = client or get_http_client()
+    sources = [
+        ("Ticketmaster", "Found {} events via Ticketmaster",
+         lambda: get_ticketmaster_events(location, interests, client)),
+        # Eventbrite API (kept as fallback)
+        ("Eventbrite", "Found {} events via Eventbrite",
+         lambda: get_eventbrite_events(location, interests, client)),
+        # Final fallback: Generate AI suggestions
+        ("AI", "Generated {} AI event suggestions",
+         lambda: generate_ai_event_suggestions(location, interests)),
+    ]
+
+    if hedge_delay is None:
+        for _, message, fetch in sources:
+            events = await fetch()
+            if events:
+                print(f"[Events INFO] {message.format(len(events))}")
+                return events
+        # If all else fails, return empty list
+        return []
+
+    running = {}  # task -> source index
+    next_source = 0
+
+    def start_next():
+        nonlocal next_source
+        running[asyncio.ensure_future(sources[next_source][2]())] = next_source
+        next_source += 1
+
+    start_next()
+    try:
+        while running:
+            # Only wait for the hedge delay while there is another source to start
+            wait_for = hedge_delay if next_source < len(sources) else None
+            done, _ = await asyncio.wait(running, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                print(f"[Events INFO] {sources[next_source - 1][0]} slower than {hedge_delay}s, hedging with {sources[next_source][0]}")
+                start_next()
+                continue
 
-def get_eventbrite_events(location: str, interests: list):
+            # Prefer the higher-priority source when several finish together
+            for task in sorted(done, key=running.get):
+                index = running.pop(task)
+                name, message, _ = sources[index]
+                if task.exception() is not None:
+                    print(f"[Events ERROR] {name} failed: {task.exception()}")
+                    continue
+                events = task.result()
+                if events:
+                    print(f"[Events INFO] {message.format(len(events))}")
+                    return events
+
+            # Every finished source came back empty, fall through to the next one now
+            if next_source < len(sources):
+                start_next()
+
+        # If all else fails, return empty list
+        return []
+    finally:
+        for task in running:
+            task.cancel()
+
+async def get_eventbrite_events(location: str, interests: list, client: Optional[httpx.AsyncClient] = None):
     """Legacy Eventbrite integration kept as fallback"""
+    client = client or get_http_client()
     base_url = "https://www.eventbriteapi.com/v3/events/search"
     headers = {"Authorization": f"Bearer {EVENTBRITE_TOKEN}"}
     now = datetime.utcnow()
@@ -51,7 +115,12 @@ def get_eventbrite_events(location: str, interests: list):
     }
 
     try:
-        response = httpx.get(base_url, headers=headers, params=params)
+        async def request():
+            response = await client.get(base_url, headers=headers, params=params)
+            raise_for_upstream_error(response)
+            return response
+
+        response = await eventbrite_breaker.call(request)
         data = response.json()
 
         if response.status_code != 200:
@@ -77,7 +146,7 @@ def get_eventbrite_events(location: str, interests: list):
         print(f"[Eventbrite EXCEPTION] {e}")
         return []
 
-def generate_ai_event_suggestions(location: str, interests: list):
+async def generate_ai_event_suggestions(location: str, interests: list):
     """Generate AI-powered event suggestions as a fallback"""
     interests_text = ", ".join(interests) if interests else "romantic activities, dining, entertainment"
     
@@ -107,7 +176,7 @@ def generate_ai_event_suggestions(location: str, interests: list):
     """
     
     try:
-        response = generate_gemini_response(prompt)
+        response = await generate_gemini_response_async(prompt)
         # Try to extract only the JSON block
         import re
         match = re.search(r'\[.*\]', response, re.DOTALL)
@@ -1,49 +1,235 @@
-import os
+import asyncio
 import httpx
-from dotenv import load_dotenv
+from typing import Optional
+from utils.http_client import get_http_client
+from utils.cache import TTLCache, normalize_key
+from utils.geocode import geocode, cached_geocode, coords_key
+from utils.circuit_breaker import get_breaker
+from utils.geo_index import GeoIndex, haversine_m, meters_to_miles
+from services.logic.restaurant_classifier import get_classifier
+from utils.config import get_settings
 
-load_dotenv()
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+settings = get_settings()
+GOOGLE_API_KEY = settings.google_api_key
 
 PLACES_API_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
 
-def get_nearby_places(location: str, interests: list):
-    results = []
-    for interest in interests:
+# Maximum number of concurrent Places text searches for one request
+PLACES_MAX_CONCURRENCY = 4
+
+# Text-search results are shared across users searching the same city
+places_cache = TTLCache(
+    "places_text_search",
+    ttl=settings.places_cache_ttl,
+    max_entries=settings.places_cache_max_entries
+)
+
+# Search radius (meters) around the geocoded location
+PLACES_SEARCH_RADIUS = settings.places_search_radius
+
+# Fails fast while Places is degraded; cache hits are still served
+places_breaker = get_breaker("google_places", slow_call_duration=3.0)
+
+# Statuses worth caching; anything else (quota, denied, ...) is treated as a failure
+CACHEABLE_STATUSES = {"OK", "ZERO_RESULTS"}
+
+# Every venue seen in a search, so proximity questions are answered locally
+venue_index = GeoIndex("venues", max_entries=settings.venue_index_max_entries)
+
+# Venues within this many meters of each other count as walkable
+WALKABLE_DISTANCE = settings.walkable_distance
+
+async def text_search(term: str, location: str, client: httpx.AsyncClient, refresh: bool = False):
+    """
+    Run a Places text search for term around location through the shared cache
+
+    When the location can be geocoded the search is biased to its coordinates
+    and PLACES_SEARCH_RADIUS, and cached by coordinates, so different spellings
+    of the same city share entries. Otherwise it falls back to the free-text
+    "{term} in {location}" query.
+
+    Args:
+        term: What to search for (an interest or food query)
+        location: Free-text location
+        client: HTTP client
+        refresh: Fetch a new result even if one is cached (used by the cache warmer)
+
+    Returns:
+        Raw Places results (raises on upstream failure, which is never cached)
+    """
+    key, params = await text_search_request(term, location, client)
+
+    async def request():
+        resp = (await client.get(PLACES_API_URL, params=params)).json()
+        status = resp.get("status", "OK")
+        if status not in CACHEABLE_STATUSES:
+            raise RuntimeError(f"Places text search failed: {status} {resp.get('error_message', '')}".strip())
+        return resp.get("results", [])
+
+    if refresh:
+        return await places_cache.refresh(key, lambda: places_breaker.call(request))
+    return await places_cache.get_or_fetch(key, lambda: places_breaker.call(request))
+
+async def text_search_request(term: str, location: str, client: Optional[httpx.AsyncClient] = None):
+    """Cache key and query parameters for a text search of term around location"""
+    return search_request_for(term, location, await geocode(location, client))
+
+def search_request_for(term: str, location: str, coords: Optional[dict]):
+    """Cache key and query parameters for a text search, given location's coordinates (None if unknown)"""
+    if coords is not None:
+        params = {
+            "query": term,
+            "location": f"{coords['lat']},{coords['lng']}",
+            "radius": PLACES_SEARCH_RADIUS,
+            "key": GOOGLE_API_KEY
+        }
+        key = (normalize_key(term), coords_key(coords), PLACES_SEARCH_RADIUS)
+    else:
         params = {
-            "query": f"{interest} in {location}",
+            "query": f"{term} in {location}",
             "key": GOOGLE_API_KEY
         }
+        key = (normalize_key(term), normalize_key(location))
+    return key, params
+
+async def text_search_expires_in(term: str, location: str) -> Optional[float]:
+    """
+    Seconds until the cached text search expires, or None if it is not cached
+
+    Only cached coordinates are used, so this never calls the Geocoding API;
+    a location that was never geocoded counts as not cached.
+    """
+    geocoded, coords = await cached_geocode(location)
+    if not geocoded:
+        return None
+    key, _ = search_request_for(term, location, coords)
+    return places_cache.ttl_remaining(key)
+
+def food_search_term(dietary_restrictions: list) -> str:
+    """Text-search term used by get_nearby_foods"""
+    return " ".join(dietary_restrictions or ["restaurants"]) + " food"
+
+def place_key(p: dict):
+    """Stable identity of a Places result"""
+    return p.get("place_id") or (p.get("name"), p.get("formatted_address"))
+
+def place_coords(p: dict) -> Optional[dict]:
+    """{"lat", "lng"} of a Places result, or None if it has no geometry"""
+    point = p.get("geometry", {}).get("location")
+    if not point or "lat" not in point or "lng" not in point:
+        return None
+    return {"lat": point["lat"], "lng": point["lng"]}
+
+def index_venues(places: list) -> None:
+    """Add Places results to the venue index"""
+    for p in places:
+        coords = place_coords(p)
+        if coords is not None:
+            venue_index.add(place_key(p), coords["lat"], coords["lng"], p.get("name"))
+
+def venues_near(lat: float, lng: float, radius_m: float = WALKABLE_DISTANCE, limit: int = 5, exclude=None):
+    """
+    Indexed venues within radius_m of (lat, lng), without calling Places
+
+    Returns:
+        List of {"name", "distance_m"}, nearest first
+    """
+    return [
+        {"name": name, "distance_m": round(distance)}
+        for _, distance, name in venue_index.within(lat, lng, radius_m, limit=limit, exclude=exclude)
+    ]
+
+def walkable_from(p: dict, coords: Optional[dict]) -> str:
+    """Names of indexed venues within walking distance of p ("" if none are known)"""
+    if coords is None:
+        return ""
+    nearby = venues_near(coords["lat"], coords["lng"], limit=3, exclude=place_key(p))
+    return ", ".join(f"{venue['name']} ({venue['distance_m']} m)" for venue in nearby)
+
+def distance_m(center: Optional[dict], coords: Optional[dict]) -> Optional[float]:
+    """Meters between the searched location and a venue, or None if either is unknown"""
+    if center is None or coords is None:
+        return None
+    return round(float(haversine_m(center["lat"], center["lng"], [coords["lat"]], [coords["lng"]])[0]), 1)
+
+def distance_from(meters: Optional[float], location: str) -> str:
+    """Human-readable distance between the searched location and a venue"""
+    if meters is None:
+        return f"Near {location}"
+    return f"{round(meters_to_miles(meters), 1)} miles from {location}"
+
+async def search_interest(interest: str, location: str, client: httpx.AsyncClient, semaphore: asyncio.Semaphore):
+    """Run a single Places text search for one interest, returning raw results"""
+    async with semaphore:
         try:
-            resp = httpx.get(PLACES_API_URL, params=params).json()
-            places = resp.get("results", [])[:2]
-            for p in places:
-                results.append({
-                    "name": p["name"],
-                    "type": interest,
-                    "address": p.get("formatted_address", ""),
-                    "rating": p.get("rating", "N/A"),
-                    "walkable_from": "TBD",
-                    "transit_suggestion": "TBD",
-                    "parking_tip": "TBD"
-                })
+            return await text_search(interest, location, client)
         except Exception as e:
             print(f"[Places Error] {e}")
+            return []
+
+async def get_nearby_places(location: str, interests: list, client: Optional[httpx.AsyncClient] = None):
+    client = client or get_http_client()
+    semaphore = asyncio.Semaphore(PLACES_MAX_CONCURRENCY)
+
+    # Query every interest concurrently; gather keeps the original interest order
+    per_interest = await asyncio.gather(
+        *(search_interest(interest, location, client, semaphore) for interest in interests)
+    )
+
+    for places in per_interest:
+        index_venues(places)
+    # Already cached by text_search, so this does not cost another request
+    center = await geocode(location, client)
+
+    results = []
+    seen = set()
+    for interest, places in zip(interests, per_interest):
+        added = 0
+        for p in places:
+            if added == 2:
+                break
+            # Overlapping interests (e.g. "museum" and "art") return the same venues
+            key = place_key(p)
+            if key in seen:
+                continue
+            seen.add(key)
+            added += 1
+            coords = place_coords(p)
+            results.append({
+                "name": p["name"],
+                "type": interest,
+                "address": p.get("formatted_address", ""),
+                "rating": p.get("rating", "N/A"),
+                "lat": coords["lat"] if coords else None,
+                "lng": coords["lng"] if coords else None,
+                "distance_m": distance_m(center, coords),
+                "walkable_from": walkable_from(p, coords),
+                "transit_suggestion": "TBD",
+                "parking_tip": "TBD"
+            })
     return results
 
-def get_nearby_foods(location: str, dietary_restrictions: list):
-    query_term = " ".join(dietary_restrictions or ["restaurants"])
-    params = {
-        "query": f"{query_term} food in {location}",
-        "key": GOOGLE_API_KEY
-    }
-    
+async def get_nearby_foods(location: str, dietary_restrictions: list, client: Optional[httpx.AsyncClient] = None):
+    client = client or get_http_client()
+
     try:
-        resp = httpx.get(PLACES_API_URL, params=params).json()
-        places = resp.get("results", [])[:5]
+        places = (await text_search(food_search_term(dietary_restrictions), location, client))[:5]
+        index_venues(places)
+        # Already cached by text_search, so this does not cost another request
+        center = await geocode(location, client)
+
+        # Dietary labels from the request take precedence over keyword defaults
+        requested_diets = [
+            diet.capitalize() for diet in dietary_restrictions or []
+            if diet.lower() in ["vegetarian", "vegan", "gluten-free", "halal", "kosher"]
+        ]
+        classify = get_classifier().classify
         
         results = []
         for p in places:
+            coords = place_coords(p)
+            meters = distance_m(center, coords)
+
             # Convert price_level to budget_range
             price_level = p.get("price_level", 2)
             budget_range = ""
@@ -56,36 +242,11 @@ def get_nearby_foods(location: str, dietary_restrictions: list):
             elif price_level == 4:
                 budget_range = "$40+"
             
-            # Generate dietary friendly options based on query
-            dietary_friendly = []
-            if dietary_restrictions:
-                for diet in dietary_restrictions:
-                    if diet.lower() in ["vegetarian", "vegan", "gluten-free", "halal", "kosher"]:
-                        dietary_friendly.append(diet.capitalize())
-            
-            if not dietary_friendly:
-                # Add some default options if none specified
-                if "italian" in p.get("name", "").lower() or "pizza" in p.get("name", "").lower():
-                    dietary_friendly = ["Vegetarian options"]
-                elif "asian" in p.get("name", "").lower() or "chinese" in p.get("name", "").lower():
-                    dietary_friendly = ["Gluten-free options"]
-                else:
-                    dietary_friendly = ["Various options"]
-            
-            # Generate things to order based on restaurant type
-            things_to_order = "Chef's choice"
-            if "pizza" in p.get("name", "").lower():
-                things_to_order = "Classic Cheese, Meat Lover's"
-            elif "sushi" in p.get("name", "").lower() or "japanese" in p.get("name", "").lower():
-                things_to_order = "Sushi Rolls, Ramen"
-            elif "burger" in p.get("name", "").lower():
-                things_to_order = "Burgers, Milkshakes"
-            elif "italian" in p.get("name", "").lower():
-                things_to_order = "Pasta, Tiramisu"
-            elif "mexican" in p.get("name", "").lower():
-                things_to_order = "Tacos, Guacamole"
+            # Cuisine, dietary labels, dishes, setting and image from one pass over name and types
+            fields = classify(p)
+            dietary_friendly = requested_diets or fields["dietary_friendly"]
             
-            # Generate a vibe based on restaurant type and rating
+            # Generate a vibe based on rating and restaurant type
             vibe = []
             if p.get("rating", 0) >= 4.5:
                 vibe.append("Upscale")
@@ -93,39 +254,25 @@ def get_nearby_foods(location: str, dietary_restrictions: list):
                 vibe.append("Cozy")
             else:
                 vibe.append("Casual")
-                
-            if "cafe" in p.get("name", "").lower():
-                vibe.append("Relaxed")
-            elif "bistro" in p.get("name", "").lower():
-                vibe.append("Intimate")
-            elif "diner" in p.get("name", "").lower():
-                vibe.append("Nostalgic")
-            else:
-                vibe.append("Romantic")
+            vibe.append(fields["setting"])
             
             # Get a random image from Unsplash based on cuisine
-            cuisine_type = "restaurant"
-            if "pizza" in p.get("name", "").lower():
-                cuisine_type = "pizza"
-            elif "sushi" in p.get("name", "").lower():
-                cuisine_type = "sushi"
-            elif "burger" in p.get("name", "").lower():
-                cuisine_type = "burger"
-            elif "italian" in p.get("name", "").lower():
-                cuisine_type = "italian food"
-            
-            image_url = f"https://source.unsplash.com/random/800x600/?{cuisine_type}"
+            image_url = f"https://source.unsplash.com/random/800x600/?{fields['image']}"
             
             results.append({
                 "id": len(results) + 1,
                 "name": p["name"],
                 "image": image_url,
-                "cuisine": p.get("types", ["restaurant"])[0].replace("_", " ").title() if p.get("types") else "Restaurant",
+                "cuisine": fields["cuisine"],
                 "rating": p.get("rating", 4.0),
-                "distance": f"{round(0.1 + (len(results) * 0.3), 1)} miles from {location}",
+                "distance": distance_from(meters, location),
+                "distance_m": meters,
+                "lat": coords["lat"] if coords else None,
+                "lng": coords["lng"] if coords else None,
+                "walkable_from": walkable_from(p, coords),
                 "vibe": vibe,
                 "dietary_friendly": ", ".join(dietary_friendly),
-                "things_to_order": things_to_order,
+                "things_to_order": fields["things_to_order"],
                 "price_level": price_level,
                 "budget_range": budget_range
             })
@@ -1,24 +1,67 @@
-import os
+import asyncio
 import httpx
 import json
-from dotenv import load_dotenv
+from typing import Optional
 from datetime import datetime, timedelta
+from utils.http_client import get_http_client, raise_for_upstream_error
+from utils.circuit_breaker import get_breaker
+from utils.geocode import geocode
+from services.providers.event_store import aget_event_store, city_key
+from utils.config import get_settings
 
-load_dotenv()
-TICKETMASTER_API_KEY = os.getenv("TICKETMASTER_API_KEY")
+settings = get_settings()
+TICKETMASTER_API_KEY = settings.ticketmaster_api_key
 
-def get_upcoming_events(location: str, interests: list):
+ticketmaster_breaker = get_breaker("ticketmaster", slow_call_duration=4.0)
+
+TICKETMASTER_EVENTS_URL = "https://app.ticketmaster.com/discovery/v2/events.json"
+
+# Search radius (miles) around the geocoded location
+TICKETMASTER_SEARCH_RADIUS = settings.ticketmaster_search_radius
+
+# Background sync: days ahead to store, and paging (Discovery caps size * page at 1000)
+TICKETMASTER_SYNC_DAYS = settings.ticketmaster_sync_days
+TICKETMASTER_PAGE_SIZE = 200
+TICKETMASTER_SYNC_MAX_PAGES = 5
+
+# Two-letter codes sent to Discovery as stateCode when they follow the city ("Portland, ME")
+US_STATE_CODES = set(
+    "AL AK AZ AR CA CO CT DE DC FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO MT NE NV NH NJ "
+    "NM NY NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY".split()
+)
+
+def location_params(location: str) -> dict:
+    """Discovery API city, plus stateCode for US locations (e.g. "Austin, TX")"""
+    parts = [part.strip() for part in (location or "").split(",")]
+    params = {"city": parts[0]}
+    if len(parts) > 1 and parts[1].upper() in US_STATE_CODES:
+        params["stateCode"] = parts[1].upper()
+    return params
+
+async def get_upcoming_events(location: str, interests: list, client: Optional[httpx.AsyncClient] = None):
     """
     Fetch upcoming events from Ticketmaster API based on location and interests.
     
     Args:
         location (str): City or location name
         interests (list): List of keywords/interests to search for
+        client (httpx.AsyncClient, optional): HTTP client, defaults to the shared pooled client
         
     Returns:
         list: List of event dictionaries with details
     """
-    base_url = "https://app.ticketmaster.com/discovery/v2/events.json"
+    base_url = TICKETMASTER_EVENTS_URL
+
+    # Cities kept fresh by the background sync are answered from the local store
+    store_city = city_key(location)
+    if store_city:
+        try:
+            store = await aget_event_store()
+            if await store.ais_fresh(store_city):
+                rows = await store.asearch(store_city, interests or [])
+                return [from_local_event(row) for row in rows]
+        except Exception as e:
+            print(f"[Ticketmaster Store ERROR] {e}")
     
     # If no API key is set, return empty list
     if not TICKETMASTER_API_KEY:
@@ -41,15 +84,30 @@ def get_upcoming_events(location: str, interests: list):
         "sort": "date,asc"  # Sort by date ascending
     }
     
-    # Only add city parameter if location is provided
-    if location:
-        # Try to parse city and state if provided in format "City, State"
-        location_parts = location.split(",")
-        city = location_parts[0].strip()
-        params["city"] = city
-    
     try:
-        response = httpx.get(base_url, params=params)
+        client = client or get_http_client()
+
+        # Only add location parameters if location is provided
+        if location:
+            coords = await geocode(location, client)
+            if coords is not None:
+                # Search by coordinates and radius when the location geocodes
+                params["latlong"] = f"{coords['lat']},{coords['lng']}"
+                params["radius"] = TICKETMASTER_SEARCH_RADIUS
+                params["unit"] = "miles"
+            else:
+                # Try to parse city and state if provided in format "City, State"
+                location_parts = location.split(",")
+                city = location_parts[0].strip()
+                params["city"] = city
+
+        async def request():
+            response = await client.get(base_url, params=params)
+            raise_for_upstream_error(response)
+            return response
+
+        # Fails fast (and falls through to the next event source) while Ticketmaster is degraded
+        response = await ticketmaster_breaker.call(request)
         data = response.json()
         
         if response.status_code != 200:
@@ -61,57 +119,7 @@ def get_upcoming_events(location: str, interests: list):
             print(f"[Ticketmaster INFO] No events found for {location} with keywords: {keywords}")
             return []
         
-        events = []
-        for event in data["_embedded"]["events"]:
-            # Get venue details if available
-            venue_name = "Venue TBD"
-            venue_address = "Address TBD"
-            
-            if "_embedded" in event and "venues" in event["_embedded"] and event["_embedded"]["venues"]:
-                venue = event["_embedded"]["venues"][0]
-                venue_name = venue.get("name", "Venue TBD")
-                
-                address_parts = []
-                if "address" in venue and "line1" in venue["address"]:
-                    address_parts.append(venue["address"]["line1"])
-                if "city" in venue and "name" in venue["city"]:
-                    address_parts.append(venue["city"]["name"])
-                if "state" in venue and "name" in venue["state"]:
-                    address_parts.append(venue["state"]["name"])
-                
-                venue_address = ", ".join(address_parts) if address_parts else "Address TBD"
-            
-            # Format the event date
-            event_date = "Date TBD"
-            if "dates" in event and "start" in event["dates"]:
-                start_info = event["dates"]["start"]
-                if "localDate" in start_info:
-                    event_date = start_info["localDate"]
-                    if "localTime" in start_info:
-                        event_date += f" at {start_info['localTime']}"
-            
-            # Get price range if available
-            price_range = "Price TBD"
-            if "priceRanges" in event and event["priceRanges"]:
-                min_price = event["priceRanges"][0].get("min")
-                max_price = event["priceRanges"][0].get("max")
-                currency = event["priceRanges"][0].get("currency", "USD")
-                
-                if min_price and max_price:
-                    price_range = f"${min_price} - ${max_price} {currency}"
-                elif min_price:
-                    price_range = f"From ${min_price} {currency}"
-            
-            events.append({
-                "title": event.get("name", "Event Name TBD"),
-                "date": event_date,
-                "venue": venue_name,
-                "address": venue_address,
-                "price_range": price_range,
-                "url": event.get("url", "#"),
-                "image": event.get("images", [{}])[0].get("url") if event.get("images") else None,
-                "type": event.get("classifications", [{}])[0].get("segment", {}).get("name", "Event") if event.get("classifications") else "Event"
-            })
+        events = [format_event(event) for event in data["_embedded"]["events"]]
         
         return events[:3]  # Return top 3 events
         
@@ -119,9 +127,163 @@ def get_upcoming_events(location: str, interests: list):
         print(f"[Ticketmaster EXCEPTION] {e}")
         return []
 
+def format_event(event: dict) -> dict:
+    """Convert a Discovery API event into the event dict returned by the providers"""
+    # Get venue details if available
+    venue_name = "Venue TBD"
+    venue_address = "Address TBD"
+    
+    if "_embedded" in event and "venues" in event["_embedded"] and event["_embedded"]["venues"]:
+        venue = event["_embedded"]["venues"][0]
+        venue_name = venue.get("name", "Venue TBD")
+        
+        address_parts = []
+        if "address" in venue and "line1" in venue["address"]:
+            address_parts.append(venue["address"]["line1"])
+        if "city" in venue and "name" in venue["city"]:
+            address_parts.append(venue["city"]["name"])
+        if "state" in venue and "name" in venue["state"]:
+            address_parts.append(venue["state"]["name"])
+        
+        venue_address = ", ".join(address_parts) if address_parts else "Address TBD"
+    
+    # Format the event date
+    event_date = "Date TBD"
+    if "dates" in event and "start" in event["dates"]:
+        start_info = event["dates"]["start"]
+        if "localDate" in start_info:
+            event_date = start_info["localDate"]
+            if "localTime" in start_info:
+                event_date += f" at {start_info['localTime']}"
+    
+    # Get price range if available
+    price_range = "Price TBD"
+    if "priceRanges" in event and event["priceRanges"]:
+        min_price = event["priceRanges"][0].get("min")
+        max_price = event["priceRanges"][0].get("max")
+        currency = event["priceRanges"][0].get("currency", "USD")
+        
+        if min_price and max_price:
+            price_range = f"${min_price} - ${max_price} {currency}"
+        elif min_price:
+            price_range = f"From ${min_price} {currency}"
+    
+    return {
+        "title": event.get("name", "Event Name TBD"),
+        "date": event_date,
+        "venue": venue_name,
+        "address": venue_address,
+        "price_range": price_range,
+        "url": event.get("url", "#"),
+        "image": event.get("images", [{}])[0].get("url") if event.get("images") else None,
+        "type": event.get("classifications", [{}])[0].get("segment", {}).get("name", "Event") if event.get("classifications") else "Event"
+    }
+
+def to_local_event(event: dict) -> Optional[dict]:
+    """Convert a Discovery API event into a LocalEvent row for the event store"""
+    start_info = event.get("dates", {}).get("start", {})
+    if "dateTime" in start_info:
+        starts_at = start_info["dateTime"]
+    elif "localDate" in start_info:
+        starts_at = f"{start_info['localDate']}T00:00:00Z"
+    else:
+        return None
+
+    formatted = format_event(event)
+
+    # Everything an interest might match: name, classifications and venue
+    keywords = [formatted["title"], formatted["venue"]]
+    for classification in event.get("classifications", []):
+        for level in ("segment", "genre", "subGenre", "type", "subType"):
+            name = classification.get(level, {}).get("name")
+            if name and name != "Undefined":
+                keywords.append(name)
+
+    return {
+        "event_id": event.get("id") or formatted["url"],
+        "starts_at": starts_at,
+        "name": formatted["title"],
+        "description": event.get("info") or event.get("pleaseNote"),
+        "location": formatted["address"],
+        "event_date": start_info.get("localDate"),
+        "event_time": start_info.get("localTime"),
+        "price": formatted["price_range"],
+        "image_url": formatted["image"],
+        "external_link": formatted["url"],
+        "venue": formatted["venue"],
+        "type": formatted["type"],
+        "keywords": " ".join(keywords)
+    }
+
+def from_local_event(row: dict) -> dict:
+    """Convert an event store row back into the provider event dict"""
+    event_date = row.get("event_date") or "Date TBD"
+    if row.get("event_date") and row.get("event_time"):
+        event_date += f" at {row['event_time']}"
+    return {
+        "title": row["name"],
+        "date": event_date,
+        "venue": row.get("venue") or "Venue TBD",
+        "address": row.get("location") or "Address TBD",
+        "price_range": row.get("price") or "Price TBD",
+        "url": row.get("external_link") or "#",
+        "image": row.get("image_url"),
+        "type": row.get("type") or "Event"
+    }
+
+async def sync_city_events(city: str, client: Optional[httpx.AsyncClient] = None) -> int:
+    """
+    Page every upcoming Ticketmaster event for city into the local event store
+
+    Args:
+        city: Location like "Austin, TX"; the state narrows the search and is part of the store key
+        client: HTTP client, defaults to the shared pooled client
+
+    Returns:
+        Number of events stored
+    """
+    if not TICKETMASTER_API_KEY:
+        return 0
+
+    client = client or get_http_client()
+    start_date = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+    end_date = (datetime.now() + timedelta(days=TICKETMASTER_SYNC_DAYS)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    local_events = {}
+    for page in range(TICKETMASTER_SYNC_MAX_PAGES):
+        params = {
+            "apikey": TICKETMASTER_API_KEY,
+            **location_params(city),
+            "startDateTime": start_date,
+            "endDateTime": end_date,
+            "size": TICKETMASTER_PAGE_SIZE,
+            "page": page,
+            "sort": "date,asc"
+        }
+
+        async def request():
+            response = await client.get(TICKETMASTER_EVENTS_URL, params=params)
+            raise_for_upstream_error(response)
+            response.raise_for_status()
+            return response
+
+        data = (await ticketmaster_breaker.call(request)).json()
+        for event in data.get("_embedded", {}).get("events", []):
+            local_event = to_local_event(event)
+            if local_event is not None:
+                local_events[local_event["event_id"]] = local_event
+
+        total_pages = data.get("page", {}).get("totalPages", 0)
+        if page + 1 >= total_pages:
+            break
+
+    store = await aget_event_store()
+    await store.areplace_city_events(city_key(city), list(local_events.values()))
+    return len(local_events)
+
 def test_ticketmaster_api(location="New York"):
     """Test function to verify Ticketmaster API is working"""
-    events = get_upcoming_events(location, ["concert", "theater"])
+    events = asyncio.run(get_upcoming_events(location, ["concert", "theater"]))
     
     if events:
         print(f"✅ Found {len(events)} events in {location}:")
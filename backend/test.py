@@ -1,3 +1,4 @@
+import asyncio
 from schemas.request_schemas import DateRequest
 from services.logic.fallback_gemini import get_fallback_gemini_plan
 
@@ -14,7 +15,7 @@ if __name__ == "__main__":
         available_clothing=["white sneakers", "denim jacket", "black dress pants"]
     )
 
-    result = get_fallback_gemini_plan(request)
+    result = asyncio.run(get_fallback_gemini_plan(request))
 
     print("\n💘 Gemini Fallback Romantic Date Plan:\n")
     print(result["gemini_fallback"])
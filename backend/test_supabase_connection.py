@@ -1,7 +1,7 @@
 import os
 import asyncio
 from dotenv import load_dotenv
-from utils.supabase import supabase, supabase_admin
+from utils.supabase import get_supabase, get_supabase_admin
 
 async def test_supabase_connection():
     """Test the connection to Supabase"""
@@ -18,6 +18,9 @@ async def test_supabase_connection():
         print(f"Supabase Key: {supabase_key[:10]}...{supabase_key[-5:]}")
         print(f"Supabase Service Key: {supabase_service_key[:10]}...{supabase_service_key[-5:]}")
         
+        supabase = await get_supabase()
+        supabase_admin = await get_supabase_admin()
+        
         # Test if clients are initialized
         print(f"Regular client initialized: {supabase is not None}")
         print(f"Admin client initialized: {supabase_admin is not None}")
@@ -25,12 +28,12 @@ async def test_supabase_connection():
         # Try to query the database
         if supabase_admin:
             # Try to get users table info
-            response = supabase_admin.table("users").select("*").limit(5).execute()
+            response = await supabase_admin.table("users").select("*").limit(5).execute()
             print(f"\nUsers table query successful: {response is not None}")
             print(f"Number of users: {len(response.data)}")
             
             # Try to get profiles table info
-            response = supabase_admin.table("profiles").select("*").limit(5).execute()
+            response = await supabase_admin.table("profiles").select("*").limit(5).execute()
             print(f"Profiles table query successful: {response is not None}")
             print(f"Number of profiles: {len(response.data)}")
             
@@ -38,7 +41,7 @@ async def test_supabase_connection():
             tables = ["hobbies", "relationships", "date_plans", "activities", "restaurants"]
             for table in tables:
                 try:
-                    response = supabase_admin.table(table).select("*").limit(1).execute()
+                    response = await supabase_admin.table(table).select("*").limit(1).execute()
                     print(f"{table.capitalize()} table query successful: {response is not None}")
                 except Exception as e:
                     print(f"Error querying {table} table: {str(e)}")
@@ -1,4 +1,5 @@
 import os
+import asyncio
 from dotenv import load_dotenv
 from services.providers.ticketmaster import get_upcoming_events
 
@@ -19,7 +20,7 @@ print("\nTesting Ticketmaster API with sample data...")
 location = "Atlanta, GA"  # Search for events in Atlanta
 interests = ["concert", "music", "show"]  # Use common event keywords
 
-events = get_upcoming_events(location, interests)
+events = asyncio.run(get_upcoming_events(location, interests))
 
 if events:
     print(f"\nSuccess! Found {len(events)} events in {location}:")
@@ -1,37 +1,78 @@
-import os
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from google.oauth2 import id_token
-from google.auth.transport import requests
-from dotenv import load_dotenv
+from google.auth import jwt as google_jwt
 from schemas.user_schemas import TokenData, User
+from utils.cache import TTLCache
+from utils.key_set import RemoteKeySet
+from utils.hashing import password_hasher, HashingBusy
+from utils.config import get_settings
+from utils import supabase as supabase_db
 
-load_dotenv()
+settings = get_settings()
 
 # Secret keys and settings
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your_secret_key_here_change_in_production")
+SECRET_KEY = settings.jwt_secret_key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
+GOOGLE_CLIENT_ID = settings.google_client_id
+# Google's ID token signing certificates (PEM by key id)
+GOOGLE_CERTS_URL = settings.google_certs_url
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+# Supabase Auth tokens are verified locally: HS256 with the project's JWT secret,
+# or asymmetric keys from the project's JWKS endpoint
+SUPABASE_JWT_SECRET = settings.supabase_jwt_secret
+SUPABASE_JWKS_URL = settings.supabase_jwks_url
+SUPABASE_JWT_AUDIENCE = settings.supabase_jwt_audience
+SUPABASE_JWT_ISSUER = settings.supabase_jwt_issuer
+SYMMETRIC_ALGORITHMS = {"HS256", "HS384", "HS512"}
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512"}
+
+# Decoded claims by token hash, kept until the token expires
+AUTH_CLAIMS_CACHE_MAX_ENTRIES = settings.auth_claims_cache_max_entries
+# Users rows behind authenticated requests
+AUTH_PROFILE_CACHE_TTL = settings.auth_profile_cache_ttl
+AUTH_PROFILE_CACHE_MAX_ENTRIES = settings.auth_profile_cache_max_entries
+# A user with no users row is remembered for a shorter time so a new sign-up shows up quickly
+AUTH_MISSING_PROFILE_TTL = 30
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+claims_cache = TTLCache("auth_claims", ttl=60, max_entries=AUTH_CLAIMS_CACHE_MAX_ENTRIES)
+profile_cache = TTLCache("auth_profiles", ttl=AUTH_PROFILE_CACHE_TTL, max_entries=AUTH_PROFILE_CACHE_MAX_ENTRIES)
+supabase_jwks = RemoteKeySet("supabase_jwks", SUPABASE_JWKS_URL)
+google_certs = RemoteKeySet("google_certs", GOOGLE_CERTS_URL, parse=dict)
+
 # Mock database - replace with real database in production
 users_db = {}
 
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+def hashing_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def verify_password(plain_password, hashed_password):
+    # Runs on the hashing process pool so bcrypt never blocks the event loop
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except HashingBusy:
+        raise hashing_busy_exception()
 
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    try:
+        return await password_hasher.hash(password)
+    except HashingBusy:
+        raise hashing_busy_exception()
 
 
 def get_user(email: str):
@@ -40,11 +81,11 @@ def get_user(email: str):
     return None
 
 
-def authenticate_user(email: str, password: str):
+async def authenticate_user(email: str, password: str):
     user = get_user(email)
     if not user:
         return False
-    if not verify_password(password, user["hashed_password"]):
+    if not await verify_password(password, user["hashed_password"]):
         return False
     return user
 
@@ -60,32 +101,183 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+def token_hash(token: str) -> str:
+    """Cache key for a token, so raw tokens are never kept in memory"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+async def verification_key(token: str) -> Any:
+    """
+    Key to verify a Supabase token with, chosen by the algorithm in its header
+
+    Raises:
+        JWTError: If the token's algorithm is not allowed or its key is unknown
+    """
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+    if algorithm in SYMMETRIC_ALGORITHMS:
+        if not SUPABASE_JWT_SECRET:
+            raise JWTError("SUPABASE_JWT_SECRET is not set")
+        return SUPABASE_JWT_SECRET
+    if algorithm in ASYMMETRIC_ALGORITHMS and header.get("kid"):
+        try:
+            key = await supabase_jwks.get_key(header["kid"])
+        except Exception as e:
+            raise JWTError(f"Signing keys unavailable: {e}")
+        if key is not None:
+            return key
+        raise JWTError("Unknown signing key")
+    raise JWTError(f"Unsupported token algorithm: {algorithm}")
+
+
+async def verify_supabase_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a Supabase Auth access token locally and return its claims
+
+    Claims are cached by token hash until the token's exp, so repeated
+    requests with the same token skip signature verification entirely.
+
+    Args:
+        token: Access token from sign_in/sign_up
+
+    Returns:
+        Decoded claims
+
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+    key = token_hash(token)
+    claims = claims_cache.get(key)
+    if claims is not None:
+        return claims
+
+    header = jwt.get_unverified_header(token)
+    # A token without exp would never expire (and could not be cached until it does)
+    options = {"verify_aud": bool(SUPABASE_JWT_AUDIENCE), "require_exp": True, "require_sub": True}
+    claims = jwt.decode(
+        token,
+        await verification_key(token),
+        algorithms=[header["alg"]],
+        audience=SUPABASE_JWT_AUDIENCE or None,
+        issuer=SUPABASE_JWT_ISSUER or None,
+        options=options
+    )
+    if not claims.get("sub"):
+        raise JWTError("Token has no subject")
+
+    remaining = claims["exp"] - time.time()
+    if remaining > 0:
+        claims_cache.set(key, claims, ttl=remaining)
+    return claims
+
+
+async def fetch_profile(user_id: str) -> Optional[Dict[str, Any]]:
+    user = await supabase_db.get_user(user_id)
+    if "error" not in user:
+        return {key: value for key, value in user.items() if key != "password_hash"}
+    if user["error"] == "User not found":
+        return None
+    # Lookup failures are not cached
+    raise RuntimeError(user["error"])
+
+
+async def get_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Users row for user_id through a bounded read-through cache
+
+    Returns:
+        The users row, or None if the user has none
+    """
+    return await profile_cache.get_or_fetch(
+        user_id,
+        lambda: fetch_profile(user_id),
+        ttl=lambda user: AUTH_MISSING_PROFILE_TTL if user is None else None
+    )
+
+
+def invalidate_user_profile(user_id: str) -> None:
+    """Drop a cached profile (e.g. after updating the user)"""
+    profile_cache.invalidate(user_id)
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
+    """
+    FastAPI dependency resolving the signed-in user from a Supabase access token
+
+    The token is verified locally and the profile comes from the profile
+    cache, so an authenticated request normally makes no call to Supabase.
+
+    Returns:
+        The users row, or the identity from the token's claims if the user
+        has no users row yet
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-        token_data = TokenData(user_id=user_id)
+        claims = await verify_supabase_token(token)
     except JWTError:
         raise credentials_exception
-    user = get_user(token_data.user_id)
+
+    user_id = claims["sub"]
+    try:
+        user = await get_user_profile(user_id)
+    except Exception as e:
+        print(f"[Auth ERROR] Profile lookup failed for {user_id}: {e}")
+        user = None
+
     if user is None:
-        raise credentials_exception
+        metadata = claims.get("user_metadata") or {}
+        user = {
+            "user_id": user_id,
+            "email": claims.get("email"),
+            "username": metadata.get("username") or metadata.get("name"),
+            "role": claims.get("role")
+        }
     return user
 
 
+async def require_admin(current_user: Dict[str, Any] = Depends(get_current_user)):
+    """
+    FastAPI dependency for monitoring routes: the signed-in user must be listed in ADMIN_USER_IDS
+
+    With no ADMIN_USER_IDS configured, nobody is an admin.
+    """
+    if str(current_user.get("user_id")) not in settings.admin_user_ids:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
+
+
+def auth_cache_stats() -> Dict[str, Any]:
+    return {
+        "claims": claims_cache.stats(),
+        "profiles": profile_cache.stats(),
+        "jwks": supabase_jwks.stats(),
+        "google_certs": google_certs.stats()
+    }
+
+
 async def verify_google_token(token: str):
+    """
+    Verify a Google Sign-In ID token against Google's cached signing certificates
+
+    The certificates are fetched asynchronously, kept for their Cache-Control
+    max-age and refreshed in the background, so verification is normally a
+    local signature check with no network call.
+    """
     try:
-        idinfo = id_token.verify_oauth2_token(token, requests.Request(), GOOGLE_CLIENT_ID)
+        kid = jwt.get_unverified_header(token).get("kid")
+        if not kid or await google_certs.get_key(kid) is None:
+            raise ValueError('Unknown signing key.')
+        idinfo = google_jwt.decode(token, certs=await google_certs.get_keys(), audience=GOOGLE_CLIENT_ID)
         
         # Check if token is valid
-        if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
+        if idinfo['iss'] not in GOOGLE_ISSUERS:
             raise ValueError('Wrong issuer.')
             
         # Get user info from token
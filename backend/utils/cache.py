@@ -0,0 +1,221 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+_MISSING = object()
+
+TTLOverride = Union[None, float, Callable[[Any], Optional[float]]]
+
+
+def normalize_key(text: Optional[str]) -> str:
+    """Normalize free text for use in a cache key (case and whitespace insensitive)"""
+    return " ".join((text or "").lower().split())
+
+
+class TTLCache:
+    """
+    In-memory cache with per-entry expiry, LRU eviction and single-flight fetches
+
+    Intended to be used from the event loop only; it is not thread-safe.
+    """
+
+    def __init__(self, name: str, ttl: float, max_entries: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh cached value, or default if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries when full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def ttl_remaining(self, key: Hashable) -> Optional[float]:
+        """Seconds until key expires, or None if it is missing or expired (not counted as a lookup)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        remaining = entry[0] - time.monotonic()
+        return remaining if remaining > 0 else None
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], ttl: TTLOverride = None) -> Any:
+        """
+        Return the cached value for key, calling fetch() on a miss
+
+        Concurrent misses for the same key share a single fetch() call. If the
+        fetch raises, every waiter receives the exception and nothing is cached.
+
+        Args:
+            key: Cache key
+            fetch: Zero-argument coroutine function producing the value
+            ttl: Optional per-entry TTL overriding the cache default, or a
+                function of the fetched value returning one
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            # The fetch runs as its own task so a cancelled caller does not abort it for the others
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch, ttl))
+            task.add_done_callback(_consume_exception)
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    async def refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], ttl: TTLOverride = None) -> Any:
+        """
+        Fetch and store a new value for key even if a fresh one is cached
+
+        Joins a fetch already in flight for the key instead of starting another.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch, ttl))
+            task.add_done_callback(_consume_exception)
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], ttl: TTLOverride) -> Any:
+        try:
+            value = await fetch()
+            self.set(key, value, ttl(value) if callable(ttl) else ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight)
+        }
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """Retrieve a failed fetch's exception so it is not reported as never retrieved"""
+    if not task.cancelled():
+        task.exception()
+
+
+class SQLiteCache:
+    """
+    Persistent key/value cache backed by a SQLite file
+
+    Values are stored as JSON. Calls are synchronous and thread-safe; use the
+    async wrappers from the event loop so disk I/O runs in a worker thread.
+    """
+
+    def __init__(self, path: str, table: str = "cache"):
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return default
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return default
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def prune(self, max_entries: int) -> None:
+        """Drop expired rows, then the soonest-expiring rows beyond max_entries"""
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (max_entries,)
+            )
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        return await asyncio.to_thread(self.get, key, default)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,162 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit is open, retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one upstream provider
+
+    Outcomes of the last window_size calls are kept in a sliding window. Once
+    at least minimum_calls are recorded, the breaker opens when the failure
+    rate or the slow-call rate reaches its threshold. While open, calls fail
+    immediately with CircuitOpenError. After cooldown seconds the breaker goes
+    half-open and lets half_open_max_calls probe calls through: a success
+    closes it, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: float = 5.0,
+        slow_call_rate_threshold: float = 0.8,
+        window_size: int = 20,
+        minimum_calls: int = 5,
+        cooldown: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.cooldown = cooldown
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = CLOSED
+        self._outcomes: deque = deque(maxlen=window_size)  # (failed, slow) per call
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        print(f"[Circuit Breaker] {self.name}: {self.state} -> {state}")
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+        elif state == CLOSED:
+            self._outcomes.clear()
+        self._half_open_calls = 0
+
+    def _retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    def before_call(self) -> None:
+        """Reserve a call slot, raising CircuitOpenError if calls are not allowed"""
+        if self.state == OPEN:
+            if self._retry_in() > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self._retry_in())
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, 0.0)
+            self._half_open_calls += 1
+
+    def record(self, failed: bool, duration: float) -> None:
+        """Record the outcome of a call that was allowed through"""
+        slow = duration >= self.slow_call_duration
+
+        if self.state == HALF_OPEN:
+            self._half_open_calls = max(0, self._half_open_calls - 1)
+            self._transition(OPEN if failed or slow else CLOSED)
+            return
+
+        self._outcomes.append((failed, slow))
+        calls = len(self._outcomes)
+        if calls < self.minimum_calls:
+            return
+
+        failure_rate = sum(1 for f, _ in self._outcomes if f) / calls
+        slow_rate = sum(1 for _, s in self._outcomes if s) / calls
+        if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+            self._transition(OPEN)
+
+    def release(self) -> None:
+        """Give back a half-open slot for a call that ended without an outcome (e.g. cancelled)"""
+        if self.state == HALF_OPEN:
+            self._half_open_calls = max(0, self._half_open_calls - 1)
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """
+        Await fn(*args, **kwargs) through the breaker
+
+        Any exception raised by fn counts as a failure; cancellation counts as
+        neither success nor failure.
+
+        Raises:
+            CircuitOpenError: If the breaker does not allow the call
+        """
+        self.before_call()
+        start = time.monotonic()
+        try:
+            result = await fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except Exception:
+            self.record(True, time.monotonic() - start)
+            raise
+        self.record(False, time.monotonic() - start)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state for monitoring"""
+        calls = len(self._outcomes)
+        return {
+            "name": self.name,
+            "state": self.state,
+            "window_calls": calls,
+            "failure_rate": round(sum(1 for f, _ in self._outcomes if f) / calls, 3) if calls else 0.0,
+            "slow_call_rate": round(sum(1 for _, s in self._outcomes if s) / calls, 3) if calls else 0.0,
+            "retry_in": round(self._retry_in(), 1) if self.state == OPEN else 0.0,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str, **options: Any) -> CircuitBreaker:
+    """Return the breaker registered under name, creating it with options on first use"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name, **options)
+    return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every registered breaker"""
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
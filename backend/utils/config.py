@@ -0,0 +1,187 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+from dotenv import load_dotenv
+
+
+def env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    return os.getenv(name, default)
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    try:
+        return int(value) if value not in (None, "") else default
+    except ValueError:
+        print(f"[Config ERROR] {name}={value!r} is not an integer, using {default}")
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    try:
+        return float(value) if value not in (None, "") else default
+    except ValueError:
+        print(f"[Config ERROR] {name}={value!r} is not a number, using {default}")
+        return default
+
+
+def env_list(name: str) -> Tuple[str, ...]:
+    """Comma-separated values ("Austin,Denver,New York"), blanks dropped"""
+    return tuple(item.strip() for item in os.getenv(name, "").split(",") if item.strip())
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Every environment setting the backend reads, parsed once
+
+    Modules keep their own constants (e.g. SUPABASE_TIMEOUT) but take the
+    values from here, so .env is loaded a single time per process and a bad
+    number falls back to its default instead of failing the import. Paths
+    left as None default to a file next to the module that uses them.
+    """
+
+    # App
+    frontend_url: str
+    jwt_secret_key: str
+    # Users allowed to read the monitoring routes (cache stats, hot keys, breakers)
+    admin_user_ids: Tuple[str, ...]
+
+    # Supabase
+    supabase_url: Optional[str]
+    supabase_key: Optional[str]
+    supabase_service_key: Optional[str]
+    supabase_timeout: float
+    supabase_page_size: int
+    supabase_max_page_size: int
+
+    # Auth
+    google_client_id: Optional[str]
+    google_certs_url: str
+    supabase_jwt_secret: Optional[str]
+    supabase_jwks_url: str
+    supabase_jwt_audience: str
+    supabase_jwt_issuer: str
+    auth_claims_cache_max_entries: int
+    auth_profile_cache_ttl: float
+    auth_profile_cache_max_entries: int
+
+    # Password hashing
+    password_hash_scheme: str
+    hash_pool_workers: int
+    hash_max_pending: int
+
+    # Gemini
+    gemini_api_key: Optional[str]
+    gemini_timeout: float
+    gemini_max_concurrency: int
+    prompt_cache_ttl: float
+    prompt_cache_max_entries: int
+    prompt_cache_path: Optional[str]
+
+    # Google Places and Geocoding
+    google_api_key: Optional[str]
+    places_cache_ttl: float
+    places_cache_max_entries: int
+    places_search_radius: int
+    venue_index_max_entries: int
+    walkable_distance: float
+    geocode_cache_path: Optional[str]
+
+    # Events
+    ticketmaster_api_key: Optional[str]
+    ticketmaster_search_radius: int
+    ticketmaster_sync_days: int
+    ticketmaster_sync_cities: Tuple[str, ...]
+    ticketmaster_sync_interval: float
+    ticketmaster_sync_max_cities: int
+    event_store_path: Optional[str]
+    event_store_max_age: float
+    eventbrite_token: Optional[str]
+    events_hedge_delay: float
+
+    # Cache warmer
+    cache_warmer_top_k: int
+    cache_warmer_interval: float
+    cache_warmer_refresh_ahead: float
+    cache_warmer_budget_per_minute: int
+    cache_warmer_decay_interval: float
+
+    # Planning tables
+    ranking_weights_path: Optional[str]
+    restaurant_keywords_path: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        supabase_url = (env_str("SUPABASE_URL") or "").rstrip("/") or None
+        hash_pool_workers = env_int("HASH_POOL_WORKERS", max(1, min(4, (os.cpu_count() or 2) // 2)))
+        return cls(
+            frontend_url=env_str("FRONTEND_URL", "http://localhost:3000"),
+            jwt_secret_key=env_str("JWT_SECRET_KEY", "your_secret_key_here_change_in_production"),
+            admin_user_ids=env_list("ADMIN_USER_IDS"),
+
+            supabase_url=supabase_url,
+            supabase_key=env_str("SUPABASE_KEY"),
+            supabase_service_key=env_str("SUPABASE_SERVICE_KEY"),
+            supabase_timeout=env_float("SUPABASE_TIMEOUT", 10.0),
+            supabase_page_size=env_int("SUPABASE_PAGE_SIZE", 50),
+            supabase_max_page_size=env_int("SUPABASE_MAX_PAGE_SIZE", 200),
+
+            google_client_id=env_str("GOOGLE_CLIENT_ID"),
+            google_certs_url=env_str("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs"),
+            supabase_jwt_secret=env_str("SUPABASE_JWT_SECRET"),
+            supabase_jwks_url=env_str("SUPABASE_JWKS_URL", f"{supabase_url or ''}/auth/v1/.well-known/jwks.json"),
+            supabase_jwt_audience=env_str("SUPABASE_JWT_AUDIENCE", "authenticated"),
+            supabase_jwt_issuer=env_str("SUPABASE_JWT_ISSUER", f"{supabase_url}/auth/v1" if supabase_url else ""),
+            auth_claims_cache_max_entries=env_int("AUTH_CLAIMS_CACHE_MAX_ENTRIES", 10000),
+            auth_profile_cache_ttl=env_float("AUTH_PROFILE_CACHE_TTL", 300.0),
+            auth_profile_cache_max_entries=env_int("AUTH_PROFILE_CACHE_MAX_ENTRIES", 10000),
+
+            password_hash_scheme=env_str("PASSWORD_HASH_SCHEME", "bcrypt"),
+            hash_pool_workers=hash_pool_workers,
+            hash_max_pending=env_int("HASH_MAX_PENDING", hash_pool_workers * 8),
+
+            gemini_api_key=env_str("GEMINI_API_KEY"),
+            gemini_timeout=env_float("GEMINI_TIMEOUT", 20.0),
+            gemini_max_concurrency=env_int("GEMINI_MAX_CONCURRENCY", 8),
+            prompt_cache_ttl=env_float("PROMPT_CACHE_TTL", 6 * 60 * 60.0),
+            prompt_cache_max_entries=env_int("PROMPT_CACHE_MAX_ENTRIES", 1000),
+            prompt_cache_path=env_str("PROMPT_CACHE_PATH"),
+
+            google_api_key=env_str("GOOGLE_API_KEY"),
+            places_cache_ttl=env_float("PLACES_CACHE_TTL", 1800.0),
+            places_cache_max_entries=env_int("PLACES_CACHE_MAX_ENTRIES", 2048),
+            places_search_radius=env_int("PLACES_SEARCH_RADIUS", 8000),
+            venue_index_max_entries=env_int("VENUE_INDEX_MAX_ENTRIES", 20000),
+            walkable_distance=env_float("WALKABLE_DISTANCE", 800.0),
+            geocode_cache_path=env_str("GEOCODE_CACHE_PATH"),
+
+            ticketmaster_api_key=env_str("TICKETMASTER_API_KEY"),
+            ticketmaster_search_radius=env_int("TICKETMASTER_SEARCH_RADIUS", 25),
+            ticketmaster_sync_days=env_int("TICKETMASTER_SYNC_DAYS", 30),
+            ticketmaster_sync_cities=env_list("TICKETMASTER_SYNC_CITIES"),
+            ticketmaster_sync_interval=env_float("TICKETMASTER_SYNC_INTERVAL", 30 * 60.0),
+            ticketmaster_sync_max_cities=env_int("TICKETMASTER_SYNC_MAX_CITIES", 10),
+            event_store_path=env_str("EVENT_STORE_PATH"),
+            event_store_max_age=env_float("EVENT_STORE_MAX_AGE", 6 * 60 * 60.0),
+            eventbrite_token=env_str("EVENTBRITE_OAUTH_TOKEN"),
+            events_hedge_delay=env_float("EVENTS_HEDGE_DELAY", 1.5),
+
+            cache_warmer_top_k=env_int("CACHE_WARMER_TOP_K", 50),
+            cache_warmer_interval=env_float("CACHE_WARMER_INTERVAL", 60.0),
+            cache_warmer_refresh_ahead=env_float("CACHE_WARMER_REFRESH_AHEAD", 300.0),
+            cache_warmer_budget_per_minute=env_int("CACHE_WARMER_BUDGET_PER_MINUTE", 30),
+            cache_warmer_decay_interval=env_float("CACHE_WARMER_DECAY_INTERVAL", 60 * 60.0),
+
+            ranking_weights_path=env_str("RANKING_WEIGHTS_PATH"),
+            restaurant_keywords_path=env_str("RESTAURANT_KEYWORDS_PATH")
+        )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Settings for this process; .env is read on the first call only"""
+    load_dotenv()
+    return Settings.from_env()
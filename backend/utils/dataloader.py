@@ -0,0 +1,111 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+
+# Loads that never resolve to a value resolve to this instead (e.g. "user not found")
+MISSING = None
+
+
+class DataLoader:
+    """
+    Coalesces individual loads into batched lookups
+
+    Every load() made in the same event-loop tick (within one request or
+    across concurrent requests) is collected and resolved by a single call
+    to batch_fn with the distinct keys. batch_fn returns a mapping of key to
+    value; keys it leaves out resolve to MISSING. Nothing is cached, so a
+    long-lived loader never serves stale rows; see MemoizedLoader.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        max_batch_size: int = 100,
+        name: Optional[str] = None
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.name = name or getattr(batch_fn, "__name__", "loader")
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._scheduled = False
+        self.batches = 0
+        self.loads = 0
+
+    def load(self, key: Hashable) -> "asyncio.Future":
+        """
+        Future resolving to the value for key
+
+        The future is shielded: a caller that is cancelled (e.g. a client
+        disconnects) does not cancel the lookup for other callers of the key.
+        """
+        self.loads += 1
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if not self._scheduled:
+                self._scheduled = True
+                # Runs after every coroutine that is ready in this tick has had its turn
+                loop.call_soon(self._dispatch)
+        return asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            chunk = {key: pending[key] for key in keys[start:start + self.max_batch_size]}
+            asyncio.ensure_future(self._resolve(chunk))
+
+    async def _resolve(self, futures: Dict[Hashable, asyncio.Future]) -> None:
+        self.batches += 1
+        try:
+            values = await self.batch_fn(list(futures))
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in futures.items():
+            if not future.done():
+                future.set_result(values.get(key, MISSING))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"name": self.name, "loads": self.loads, "batches": self.batches}
+
+
+class MemoizedLoader:
+    """
+    Request-scoped view of a DataLoader that remembers what it loaded
+
+    Repeated loads of a key share one result for the lifetime of this object;
+    new keys go straight to the underlying loader, so they still batch with
+    every other load in the same tick. Failed loads are forgotten so a later
+    load can retry.
+    """
+
+    def __init__(self, loader: DataLoader):
+        self.loader = loader
+        self._memo: Dict[Hashable, asyncio.Future] = {}
+
+    def load(self, key: Hashable) -> "asyncio.Future":
+        future = self._memo.get(key)
+        if future is None:
+            future = self._memo[key] = self.loader.load(key)
+            future.add_done_callback(lambda f: self._forget_failure(key, f))
+        return asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def clear(self, key: Hashable) -> None:
+        """Forget a memoized value (e.g. after writing it)"""
+        self._memo.pop(key, None)
+
+    def _forget_failure(self, key: Hashable, future: "asyncio.Future") -> None:
+        failed = future.cancelled() or future.exception() is not None
+        if failed and self._memo.get(key) is future:
+            del self._memo[key]
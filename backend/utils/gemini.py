@@ -1,17 +1,87 @@
-import os
-from dotenv import load_dotenv
-import google.generativeai as genai
-import concurrent.futures
+import asyncio
+from typing import Optional, TYPE_CHECKING
+from utils.circuit_breaker import get_breaker
+from utils.config import get_settings
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+settings = get_settings()
+
+GEMINI_MODEL_NAME = "models/gemini-1.5-pro-latest"
+
+# Default per-call timeout in seconds
+GEMINI_TIMEOUT = settings.gemini_timeout
+
+# Maximum number of Gemini calls in flight at once on this worker
+GEMINI_MAX_CONCURRENCY = settings.gemini_max_concurrency
+
+gemini_breaker = get_breaker("gemini", slow_call_duration=15.0)
+
+_model: Optional["genai.GenerativeModel"] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_model() -> "genai.GenerativeModel":
+    """
+    Return the shared model instance, creating it on first use
+
+    The Gemini SDK is imported and configured here rather than at import
+    time; it is the slowest import in the app and most workers start long
+    before their first Gemini call.
+    """
+    global _model
+    if _model is None:
+        import google.generativeai as genai
+        genai.configure(api_key=settings.gemini_api_key)
+        _model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _model
+
+
+def get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+    return _semaphore
+
+
+async def generate_gemini_response_async(prompt: str, timeout: Optional[float] = GEMINI_TIMEOUT) -> str:
+    """
+    Generate a response with the native async Gemini API
+
+    Args:
+        prompt: Prompt text
+        timeout: Seconds to wait for the response (None waits indefinitely)
+
+    Returns:
+        Response text
+
+    Raises:
+        asyncio.TimeoutError: If the call does not finish within timeout,
+            including time spent waiting for a concurrency slot; the
+            underlying request is cancelled. Cancelling the awaiting task
+            cancels the request as well.
+        CircuitOpenError: If Gemini has been failing and its breaker is open
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    semaphore = get_semaphore()
+
+    # Queueing for a slot counts toward the timeout, but only the call itself
+    # counts toward the breaker (a busy worker is not a failing Gemini)
+    await asyncio.wait_for(semaphore.acquire(), timeout)
+    try:
+        remaining = None if deadline is None else deadline - loop.time()
+        if remaining is not None and remaining <= 0:
+            raise asyncio.TimeoutError()
+        response = await gemini_breaker.call(
+            lambda: asyncio.wait_for(get_model().generate_content_async(prompt), remaining)
+        )
+    finally:
+        semaphore.release()
+    return response.text
 
-load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
 def generate_gemini_response(prompt: str) -> str:
-    def run_blocking():
-        model = genai.GenerativeModel("models/gemini-1.5-pro-latest")
-        response = model.generate_content(prompt)
-        return response.text
-
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        future = executor.submit(run_blocking)
-        return future.result()
\ No newline at end of file
+    """Blocking variant for scripts; never call this from the event loop"""
+    return get_model().generate_content(prompt).text
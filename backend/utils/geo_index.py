@@ -0,0 +1,156 @@
+import math
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_MILE = 1609.344
+
+
+def haversine_m(lat: float, lng: float, lats, lngs) -> np.ndarray:
+    """Great-circle distances in meters from (lat, lng) to every point in lats/lngs"""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(np.asarray(lats, dtype=float))
+    dlat = lat2 - lat1
+    dlng = np.radians(np.asarray(lngs, dtype=float)) - math.radians(lng)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def meters_to_miles(meters: float) -> float:
+    return meters / METERS_PER_MILE
+
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) in degrees of a geohash cell at precision"""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+class GeoIndex:
+    """
+    In-memory spatial index of points bucketed into geohash-sized grid cells
+
+    Cells are addressed by integer (row, column) rather than by geohash string,
+    so the cells covering a search area are plain index ranges. Radius and
+    nearest-neighbour queries only look at the buckets overlapping the search
+    area and compute distances for those candidates in one vectorized
+    haversine pass. The oldest points are evicted once max_entries
+    is reached; re-adding a point refreshes it.
+    """
+
+    def __init__(self, name: str, precision: int = 6, max_entries: int = 20000):
+        self.name = name
+        self.precision = precision
+        self.max_entries = max_entries
+        self.cell_height, self.cell_width = geohash_cell_size(precision)
+        self.columns = int(round(360.0 / self.cell_width))
+        self._points: "OrderedDict[Hashable, Tuple[float, float, Tuple[int, int], Any]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, int], set] = {}
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def add(self, key: Hashable, lat: float, lng: float, value: Any = None) -> None:
+        """Index value at (lat, lng) under key, replacing any previous entry for key"""
+        self.remove(key)
+        cell = self._cell(lat, lng)
+        self._points[key] = (lat, lng, cell, value)
+        self._buckets.setdefault(cell, set()).add(key)
+
+        while len(self._points) > self.max_entries:
+            self.remove(next(iter(self._points)))
+            self.evictions += 1
+
+    def remove(self, key: Hashable) -> None:
+        entry = self._points.pop(key, None)
+        if entry is None:
+            return
+        bucket = self._buckets.get(entry[2])
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[entry[2]]
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        row = int((min(lat, 90.0) + 90.0) // self.cell_height)
+        column = int(((lng + 180.0) % 360.0) // self.cell_width)
+        return row, column
+
+    def _cells_within(self, lat: float, lng: float, radius_m: float) -> set:
+        """Cells overlapping the bounding box of the search circle"""
+        dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        dlng = min(180.0, dlat / cos_lat)
+
+        row_min, column_min = self._cell(max(-90.0, lat - dlat), lng - dlng)
+        row_max, column_max = self._cell(min(90.0, lat + dlat), lng + dlng)
+        if dlng >= 180.0:
+            columns = range(self.columns)
+        elif column_max < column_min:
+            # Wraps around the antimeridian
+            columns = list(range(column_min, self.columns)) + list(range(0, column_max + 1))
+        else:
+            columns = range(column_min, column_max + 1)
+        return {(row, column) for row in range(row_min, row_max + 1) for column in columns}
+
+    def _candidates(self, lat: float, lng: float, radius_m: float) -> List[Hashable]:
+        cells = self._cells_within(lat, lng, radius_m)
+        if len(cells) > len(self._buckets):
+            # Search area is larger than the populated area; scanning buckets is cheaper
+            return [key for cell, keys in self._buckets.items() if cell in cells for key in keys]
+        return [key for cell in cells for key in self._buckets.get(cell, ())]
+
+    def within(
+        self,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        limit: Optional[int] = None,
+        exclude: Optional[Hashable] = None
+    ) -> List[Tuple[Hashable, float, Any]]:
+        """
+        Points within radius_m of (lat, lng)
+
+        Args:
+            lat: Latitude of the search center
+            lng: Longitude of the search center
+            radius_m: Search radius in meters
+            limit: Maximum number of points to return
+            exclude: Key to leave out (e.g. the venue being searched around)
+
+        Returns:
+            List of (key, distance in meters, value), nearest first
+        """
+        keys = [key for key in self._candidates(lat, lng, radius_m) if key != exclude]
+        if not keys:
+            return []
+
+        points = [self._points[key] for key in keys]
+        distances = haversine_m(lat, lng, [p[0] for p in points], [p[1] for p in points])
+        inside = np.flatnonzero(distances <= radius_m)
+        if limit is not None and len(inside) > limit:
+            inside = inside[np.argpartition(distances[inside], limit - 1)[:limit]]
+        inside = inside[np.argsort(distances[inside], kind="stable")]
+        return [(keys[i], float(distances[i]), points[i][3]) for i in inside]
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 1,
+        max_radius_m: float = 5000.0,
+        exclude: Optional[Hashable] = None
+    ) -> List[Tuple[Hashable, float, Any]]:
+        """Up to k nearest points within max_radius_m of (lat, lng), nearest first"""
+        return self.within(lat, lng, max_radius_m, limit=k, exclude=exclude)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "points": len(self._points),
+            "buckets": len(self._buckets),
+            "evictions": self.evictions
+        }
@@ -0,0 +1,117 @@
+import os
+import asyncio
+import threading
+import httpx
+from typing import Dict, Optional, Tuple
+from utils.cache import TTLCache, SQLiteCache, normalize_key
+from utils.http_client import get_http_client
+from utils.circuit_breaker import get_breaker
+from utils.config import get_settings
+
+settings = get_settings()
+API_KEY = settings.google_api_key
+
+GEOCODE_API_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+
+# Location strings resolve to the same coordinates for as long as we care, so the
+# on-disk cache never expires; the in-memory layer only bounds memory use.
+GEOCODE_CACHE_PATH = settings.geocode_cache_path or (
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "geocode_cache.sqlite3")
+)
+geocode_memory_cache = TTLCache("geocode", ttl=24 * 60 * 60, max_entries=4096)
+# Unresolvable locations are remembered briefly so typos do not hammer the API
+NEGATIVE_TTL = 10 * 60
+
+geocode_breaker = get_breaker("google_geocoding", slow_call_duration=3.0)
+
+_disk_cache: Optional[SQLiteCache] = None
+_disk_cache_lock = threading.Lock()
+_NOT_CACHED = object()
+
+
+def get_disk_cache() -> SQLiteCache:
+    """Shared SQLite cache; opening it creates the table, so call aget_disk_cache from the event loop"""
+    global _disk_cache
+    if _disk_cache is None:
+        with _disk_cache_lock:
+            if _disk_cache is None:
+                _disk_cache = SQLiteCache(GEOCODE_CACHE_PATH, table="geocode")
+    return _disk_cache
+
+
+async def aget_disk_cache() -> SQLiteCache:
+    if _disk_cache is not None:
+        return _disk_cache
+    return await asyncio.to_thread(get_disk_cache)
+
+
+async def geocode(location: str, client: Optional[httpx.AsyncClient] = None) -> Optional[Dict[str, float]]:
+    """
+    Resolve a free-text location to coordinates
+
+    Lookups go memory cache -> SQLite cache -> Google Geocoding API, and
+    concurrent lookups of the same location share one request.
+
+    Args:
+        location: Free-text location such as "Austin, TX"
+        client: HTTP client, defaults to the shared pooled client
+
+    Returns:
+        {"lat": float, "lng": float}, or None if the location cannot be resolved
+    """
+    key = normalize_key(location)
+    if not key:
+        return None
+
+    async def fetch():
+        disk_cache = await aget_disk_cache()
+        coords = await disk_cache.aget(key)
+        if coords is not None:
+            return coords
+
+        http = client or get_http_client()
+        response = await geocode_breaker.call(http.get, GEOCODE_API_URL, params={"address": location, "key": API_KEY})
+        resp = response.json()
+        status = resp.get("status", "OK")
+        if status == "ZERO_RESULTS" or (status == "OK" and not resp.get("results")):
+            return None
+        if status != "OK":
+            raise RuntimeError(f"Geocoding failed: {status} {resp.get('error_message', '')}".strip())
+
+        point = resp["results"][0]["geometry"]["location"]
+        coords = {"lat": point["lat"], "lng": point["lng"]}
+        await disk_cache.aset(key, coords)
+        return coords
+
+    try:
+        coords = await geocode_memory_cache.get_or_fetch(
+            key, fetch, ttl=lambda value: NEGATIVE_TTL if value is None else None
+        )
+    except Exception as e:
+        print(f"[Geocode Error] {e}")
+        return None
+    return coords
+
+
+async def cached_geocode(location: str) -> Tuple[bool, Optional[Dict[str, float]]]:
+    """
+    Coordinates for location from the memory or SQLite cache, never the API
+
+    Returns:
+        (cached, coords); cached is False when resolving location would call
+        the Geocoding API
+    """
+    key = normalize_key(location)
+    if not key:
+        return True, None
+    coords = geocode_memory_cache.get(key, _NOT_CACHED)
+    if coords is not _NOT_CACHED:
+        return True, coords
+    disk_cache = await aget_disk_cache()
+    coords = await disk_cache.aget(key)
+    return coords is not None, coords
+
+
+def coords_key(coords: Dict[str, float], precision: int = 3) -> str:
+    """Stable cache key for coordinates (3 decimals is roughly 100 m)"""
+    return f"{round(coords['lat'], precision)},{round(coords['lng'], precision)}"
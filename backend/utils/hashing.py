@@ -0,0 +1,155 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+from utils.config import get_settings
+
+settings = get_settings()
+
+# passlib scheme for new hashes ("bcrypt", or "argon2" with argon2-cffi installed).
+# Existing bcrypt hashes keep verifying after a switch and are reported as needing a rehash.
+PASSWORD_HASH_SCHEME = settings.password_hash_scheme
+# Worker processes doing the hashing; each keeps one core busy for ~100-300 ms per hash
+HASH_POOL_WORKERS = settings.hash_pool_workers
+# Hashes queued or running before new ones are rejected instead of waiting
+HASH_MAX_PENDING = settings.hash_max_pending
+
+_crypt_context = None
+
+
+class HashingBusy(Exception):
+    """The hashing pool has HASH_MAX_PENDING requests outstanding"""
+
+
+def get_crypt_context():
+    """passlib context for PASSWORD_HASH_SCHEME, built once per process"""
+    global _crypt_context
+    if _crypt_context is None:
+        from passlib.context import CryptContext
+        schemes = [PASSWORD_HASH_SCHEME] + (["bcrypt"] if PASSWORD_HASH_SCHEME != "bcrypt" else [])
+        _crypt_context = CryptContext(schemes=schemes, deprecated="auto")
+    return _crypt_context
+
+
+# The functions below run inside the worker processes
+
+def _hash(password: str) -> str:
+    return get_crypt_context().hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return get_crypt_context().verify(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Password hashing on a bounded process pool
+
+    bcrypt and argon2 are deliberately slow and hold the GIL, so running them
+    in the web worker (or its thread pool) stalls every other request. Here
+    they run in separate processes; callers await the result. When
+    max_pending hashes are already queued or running, new ones fail fast with
+    HashingBusy rather than piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int = HASH_POOL_WORKERS, max_pending: int = HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on the first hash, so workers that never hash never pay for the pool
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, fn, *args) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HashingBusy(f"{self.pending} password hashes pending")
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            job = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died; the next call gets a fresh pool
+            self.failed += 1
+            self._executor = None
+            raise
+
+        # A job stays pending until the pool finishes it, even if its caller is
+        # cancelled (a running job cannot be stopped), so the limit stays accurate
+        self.pending += 1
+        job.add_done_callback(lambda done: self._job_done_threadsafe(loop, done, started))
+        return await asyncio.wrap_future(job)
+
+    def _job_done_threadsafe(self, loop: asyncio.AbstractEventLoop, job: "Future", started: float) -> None:
+        # Called from the pool's management thread
+        try:
+            loop.call_soon_threadsafe(self._job_done, job, started)
+        except RuntimeError:
+            # The loop is closed (shutdown); nothing is waiting for the counters
+            pass
+
+    def _job_done(self, job: "Future", started: float) -> None:
+        self.pending -= 1
+        if job.cancelled():
+            return
+        error = job.exception()
+        if error is not None:
+            self.failed += 1
+            if isinstance(error, BrokenProcessPool):
+                # A worker died; the next call gets a fresh pool
+                self._executor = None
+            return
+
+        elapsed = time.perf_counter() - started
+        self.completed += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+
+    async def hash(self, password: str) -> str:
+        """Hash password with PASSWORD_HASH_SCHEME"""
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Check password against a stored hash (any configured scheme)"""
+        return await self._run(_verify, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a stored hash uses a deprecated scheme (cheap, runs inline)"""
+        return get_crypt_context().needs_update(hashed_password)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scheme": PASSWORD_HASH_SCHEME,
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_ms": round(self.total_seconds / self.completed * 1000, 1) if self.completed else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 1)
+        }
+
+
+password_hasher = PasswordHasher()
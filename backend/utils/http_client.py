@@ -0,0 +1,100 @@
+import asyncio
+import importlib.util
+from typing import Dict, Optional
+import httpx
+
+# Explicit timeouts for every outbound provider call
+HTTP_TIMEOUT = httpx.Timeout(connect=3.0, read=8.0, write=5.0, pool=3.0)
+
+# Keep-alive pool shared by all providers
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0
+)
+
+# Maximum concurrent requests to a single upstream host
+MAX_CONNECTIONS_PER_HOST = 20
+
+# HTTP/2 is only negotiated when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+class UpstreamError(Exception):
+    """An upstream answered with a server-side or rate-limit error"""
+
+
+def raise_for_upstream_error(response: httpx.Response) -> None:
+    """Raise UpstreamError for 5xx and 429 responses, which signal a degraded provider"""
+    if response.status_code >= 500 or response.status_code == 429:
+        raise UpstreamError(f"{response.request.url.host} returned {response.status_code}")
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that caps the number of in-flight requests per host"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self._max_per_host)
+
+        async with semaphore:
+            response = await self._transport.handle_async_request(request)
+            # Read the body while holding the slot so the limit covers the whole exchange
+            await response.aread()
+            return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build the application-scoped HTTP client
+
+    Returns:
+        An httpx.AsyncClient with keep-alive pooling, HTTP/2 (when available),
+        per-host connection limits and explicit timeouts
+    """
+    transport = httpx.AsyncHTTPTransport(limits=HTTP_LIMITS, http2=HTTP2_AVAILABLE)
+    return httpx.AsyncClient(
+        transport=HostLimitedTransport(transport, MAX_CONNECTIONS_PER_HOST),
+        timeout=HTTP_TIMEOUT
+    )
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client (called from the FastAPI lifespan hook)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and release pooled connections"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client
+
+    The client is normally created by the lifespan hook in main.py; scripts
+    that call providers directly get one lazily on first use.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
@@ -0,0 +1,140 @@
+import asyncio
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+from utils.http_client import get_http_client, raise_for_upstream_error
+
+# Used when the key endpoint sends no usable Cache-Control max-age (seconds)
+DEFAULT_KEY_SET_MAX_AGE = 60 * 60
+# Refresh this long (seconds) before the cached keys expire
+KEY_SET_REFRESH_MARGIN = 5 * 60
+# Minimum seconds between fetches triggered by an unknown key id
+KEY_SET_MIN_REFETCH_INTERVAL = 30
+
+_key_sets: List["RemoteKeySet"] = []
+
+
+def cache_max_age(response: httpx.Response) -> Optional[float]:
+    """max-age from a response's Cache-Control header, minus its Age"""
+    match = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+    if not match:
+        return None
+    try:
+        age = float(response.headers.get("age", "0"))
+    except ValueError:
+        age = 0.0
+    return max(0.0, float(match.group(1)) - age)
+
+
+def parse_jwks(document: Any) -> Dict[str, Dict[str, Any]]:
+    """Keys of a JSON Web Key Set by kid"""
+    return {key["kid"]: key for key in document.get("keys", []) if "kid" in key}
+
+
+class RemoteKeySet:
+    """
+    Public signing keys fetched from a URL and cached for local token verification
+
+    Keys are kept for the endpoint's Cache-Control max-age and refreshed in the
+    background shortly before they expire, so verifying a token normally costs
+    no network call. An unknown key id (a key rotation) triggers an early
+    refetch, at most once per KEY_SET_MIN_REFETCH_INTERVAL. If a refresh fails,
+    the previous keys stay in use until a later refresh succeeds.
+    """
+
+    def __init__(self, name: str, url: str, parse: Callable[[Any], Dict[str, Any]] = parse_jwks):
+        self.name = name
+        self.url = url
+        self.parse = parse
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.fetches = 0
+        self.failures = 0
+        _key_sets.append(self)
+
+    async def _fetch(self) -> None:
+        response = await get_http_client().get(self.url)
+        raise_for_upstream_error(response)
+        response.raise_for_status()
+        keys = self.parse(response.json())
+
+        max_age = cache_max_age(response)
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + (DEFAULT_KEY_SET_MAX_AGE if max_age is None else max_age)
+        self.fetches += 1
+        self._schedule_refresh()
+
+    async def _refresh(self, force: bool = False) -> None:
+        async with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if not force and self._keys and time.monotonic() < self._expires_at:
+                return
+            if force and time.monotonic() - self._fetched_at < KEY_SET_MIN_REFETCH_INTERVAL:
+                return
+            try:
+                await self._fetch()
+            except Exception as e:
+                self.failures += 1
+                print(f"[Key Set ERROR] {self.name}: {e}")
+                if not self._keys:
+                    raise
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        delay = max(1.0, self._expires_at - time.monotonic() - KEY_SET_REFRESH_MARGIN)
+        self._refresh_task = asyncio.ensure_future(self._refresh_later(delay))
+
+    async def _refresh_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._refresh_task = None
+        try:
+            await self._refresh(force=True)
+        except Exception:
+            pass
+        if self._refresh_task is None:
+            # The refresh failed; try again after the minimum interval
+            self._refresh_task = asyncio.ensure_future(self._refresh_later(KEY_SET_MIN_REFETCH_INTERVAL))
+
+    async def get_keys(self) -> Dict[str, Any]:
+        """All current keys by key id"""
+        if not self._keys or time.monotonic() >= self._expires_at:
+            await self._refresh()
+        return self._keys
+
+    async def get_key(self, kid: str) -> Optional[Any]:
+        """The key with id kid, refetching once if it is unknown"""
+        keys = await self.get_keys()
+        if kid not in keys:
+            await self._refresh(force=True)
+            keys = self._keys
+        return keys.get(kid)
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "keys": len(self._keys),
+            "expires_in": round(max(0.0, self._expires_at - time.monotonic()), 1),
+            "fetches": self.fetches,
+            "failures": self.failures
+        }
+
+
+async def close_key_sets() -> None:
+    """Stop background refreshes (called from the FastAPI lifespan hook)"""
+    for key_set in _key_sets:
+        await key_set.close()
@@ -0,0 +1,96 @@
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Any, Awaitable, Callable, Optional
+from utils.cache import TTLCache, SQLiteCache, normalize_key
+from utils.config import get_settings
+
+settings = get_settings()
+
+# Gemini answers for the same canonical request are reused for this long (seconds)
+PROMPT_CACHE_TTL = settings.prompt_cache_ttl
+PROMPT_CACHE_MAX_ENTRIES = settings.prompt_cache_max_entries
+# Set to a file path to keep cached answers across restarts
+PROMPT_CACHE_PATH = settings.prompt_cache_path
+
+# Prune the on-disk cache back to its size bound every this many writes
+PRUNE_EVERY = 100
+
+prompt_cache = TTLCache("gemini_prompts", ttl=PROMPT_CACHE_TTL, max_entries=PROMPT_CACHE_MAX_ENTRIES)
+
+_disk_cache: Optional[SQLiteCache] = None
+_disk_cache_lock = threading.Lock()
+_writes_since_prune = 0
+
+
+def get_disk_cache() -> Optional[SQLiteCache]:
+    """SQLite cache at PROMPT_CACHE_PATH (None if unset); call aget_disk_cache from the event loop"""
+    global _disk_cache
+    if _disk_cache is None and PROMPT_CACHE_PATH:
+        with _disk_cache_lock:
+            if _disk_cache is None:
+                _disk_cache = SQLiteCache(PROMPT_CACHE_PATH, table="prompts")
+    return _disk_cache
+
+
+async def aget_disk_cache() -> Optional[SQLiteCache]:
+    if _disk_cache is not None or not PROMPT_CACHE_PATH:
+        return _disk_cache
+    return await asyncio.to_thread(get_disk_cache)
+
+
+def canonical_request_key(kind: str, **fields: Any) -> str:
+    """
+    Build a cache key from the request fields that shape a prompt
+
+    Strings are case and whitespace normalized and lists are normalized,
+    de-duplicated and sorted, so ["Art", "coffee"] and ["coffee", "art "]
+    produce the same key.
+
+    Args:
+        kind: Prompt family, e.g. "date_plan" or "fashion"
+        **fields: Request fields used in the prompt
+
+    Returns:
+        Hex digest identifying the canonical request
+    """
+    canonical = {}
+    for name, value in fields.items():
+        if isinstance(value, (list, tuple, set)):
+            canonical[name] = sorted({normalize_key(str(item)) for item in value if item})
+        elif value is None:
+            canonical[name] = ""
+        else:
+            canonical[name] = normalize_key(str(value))
+
+    payload = json.dumps({"kind": kind, "fields": canonical}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def get_or_generate(key: str, generate: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return the cached answer for key, calling generate() on a miss
+
+    Lookups go memory -> optional SQLite file -> generate(). Concurrent misses
+    share one generate() call, and failures are never cached.
+    """
+    async def fetch():
+        global _writes_since_prune
+        disk_cache = await aget_disk_cache()
+        if disk_cache is not None:
+            value = await disk_cache.aget(key)
+            if value is not None:
+                return value
+
+        value = await generate()
+
+        if disk_cache is not None:
+            await disk_cache.aset(key, value, PROMPT_CACHE_TTL)
+            _writes_since_prune += 1
+            if _writes_since_prune >= PRUNE_EVERY:
+                _writes_since_prune = 0
+                await asyncio.to_thread(disk_cache.prune, PROMPT_CACHE_MAX_ENTRIES)
+        return value
+
+    return await prompt_cache.get_or_fetch(key, fetch)
@@ -1,27 +1,234 @@
-import os
-from typing import Dict, Any, Optional, List
-from supabase import create_client, Client
-from dotenv import load_dotenv
+import asyncio
+import base64
+import json
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple, TYPE_CHECKING
+from utils.config import get_settings
+from utils.dataloader import DataLoader, MemoizedLoader
 
-# Load environment variables
-load_dotenv()
+if TYPE_CHECKING:
+    from supabase import AsyncClient, AsyncClientOptions
 
-# Initialize Supabase client
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_KEY")
-supabase_service_key = os.getenv("SUPABASE_SERVICE_KEY")
+settings = get_settings()
 
-# Check if credentials are set
-if not supabase_url or not supabase_key:
-    raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in .env file")
+# Supabase credentials; missing ones only fail the first query, not the import
+supabase_url = settings.supabase_url
+supabase_key = settings.supabase_key
+supabase_service_key = settings.supabase_service_key
 
-# Initialize Supabase client
-supabase: Client = create_client(supabase_url, supabase_key)
+# Seconds before a PostgREST request is abandoned
+SUPABASE_TIMEOUT = settings.supabase_timeout
 
-# Service client with admin privileges (for server-side operations)
-supabase_admin: Optional[Client] = None
-if supabase_service_key:
-    supabase_admin = create_client(supabase_url, supabase_service_key)
+# Rows per page for list queries, and the most a caller may ask for
+SUPABASE_PAGE_SIZE = settings.supabase_page_size
+SUPABASE_MAX_PAGE_SIZE = settings.supabase_max_page_size
+
+# Columns returned by list queries (never password_hash)
+USER_LIST_COLUMNS = "user_id,username,email,created_at,last_login"
+DATE_PLAN_LIST_COLUMNS = "date_plan_id,title,scheduled_for,status,location,budget,created_at"
+# favorite_dates rows are the saved plan as sent by the client, so every column is payload
+FAVORITE_DATE_COLUMNS = "*"
+
+# Async clients are created on first use, inside the running event loop. Each keeps
+# one pooled HTTP/2 connection to PostgREST, so queries never block the loop. The
+# supabase SDK itself is imported then too, keeping it out of worker start-up.
+_supabase: Optional["AsyncClient"] = None
+_supabase_admin: Optional["AsyncClient"] = None
+_client_lock = asyncio.Lock()
+
+
+def client_options() -> "AsyncClientOptions":
+    from supabase import AsyncClientOptions
+    # The server never keeps a user's session on a shared client
+    return AsyncClientOptions(
+        auto_refresh_token=False,
+        persist_session=False,
+        postgrest_client_timeout=SUPABASE_TIMEOUT
+    )
+
+
+async def create_client(key: str) -> "AsyncClient":
+    from supabase import acreate_client
+    return await acreate_client(supabase_url, key, options=client_options())
+
+
+async def get_supabase() -> "AsyncClient":
+    """
+    Shared Supabase client authenticated with the anon key
+
+    Raises:
+        ValueError: If SUPABASE_URL or SUPABASE_KEY is not set
+    """
+    global _supabase
+    if _supabase is None:
+        if not supabase_url or not supabase_key:
+            raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in .env file")
+        async with _client_lock:
+            if _supabase is None:
+                _supabase = await create_client(supabase_key)
+    return _supabase
+
+
+async def get_supabase_admin() -> Optional["AsyncClient"]:
+    """Shared Supabase client with admin privileges (for server-side operations), or None without a service key"""
+    global _supabase_admin
+    if not supabase_url or not supabase_service_key:
+        return None
+    if _supabase_admin is None:
+        async with _client_lock:
+            if _supabase_admin is None:
+                _supabase_admin = await create_client(supabase_service_key)
+    return _supabase_admin
+
+
+async def close_supabase() -> None:
+    """Close the clients' pooled connections (called from the FastAPI lifespan hook)"""
+    global _supabase, _supabase_admin
+    for client in (_supabase, _supabase_admin):
+        # The client has no public close; the postgrest property would create a
+        # PostgREST client just to close it, so only close one that exists
+        postgrest = getattr(client, "_postgrest", None)
+        if postgrest is not None:
+            await postgrest.aclose()
+    _supabase = None
+    _supabase_admin = None
+
+
+# Write Helpers
+async def upsert_rows(
+    table: str,
+    rows: List[Dict[str, Any]],
+    on_conflict: str,
+    ignore_duplicates: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Insert rows, updating (or with ignore_duplicates, skipping) rows that
+    conflict on the on_conflict columns, in one round trip
+    
+    Columns missing from a row keep their current value on update and their
+    default on insert.
+    
+    Returns:
+        The inserted or updated rows
+    """
+    supabase_admin = await get_supabase_admin()
+    if not supabase_admin:
+        raise RuntimeError("Admin client not initialized")
+    
+    response = await supabase_admin.table(table).upsert(
+        rows, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates, default_to_null=False
+    ).execute()
+    return response.data or []
+
+
+# Pagination Helpers
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Opaque cursor for the keyset values of the last row on a page"""
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Keyset values from a cursor made by encode_cursor (raises ValueError if it is malformed)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def filter_value(value: Any) -> str:
+    """Quote a value for a PostgREST logical filter (timestamps contain reserved characters)"""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def keyset_filter(keys: List[str], values: Dict[str, Any], descending: bool) -> str:
+    """
+    PostgREST or=(...) condition selecting rows after values in (keys) order
+    
+    For keys (a, b) descending: a < va, or a = va and b < vb.
+    """
+    op = "lt" if descending else "gt"
+    conditions = []
+    for i, key in enumerate(keys):
+        parts = [f"{k}.eq.{filter_value(values[k])}" for k in keys[:i]]
+        parts.append(f"{key}.{op}.{filter_value(values[key])}")
+        conditions.append(parts[0] if len(parts) == 1 else f"and({','.join(parts)})")
+    return ",".join(conditions)
+
+
+async def select_page(
+    table: str,
+    columns: str,
+    keys: List[str],
+    filters: Optional[Dict[str, Any]] = None,
+    limit: int = SUPABASE_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    descending: bool = True
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    One page of a keyset-paginated query
+    
+    Rows are ordered by keys, which must be unique together (e.g. created_at
+    plus the primary key). Each page starts where the cursor left off, so
+    fetching page N costs the same as page 1, unlike OFFSET.
+    
+    Args:
+        table: Table name
+        columns: Comma-separated projection; keys are added if missing
+        keys: Ordering columns, unique together
+        filters: Column equality filters
+        limit: Page size (capped at SUPABASE_MAX_PAGE_SIZE)
+        cursor: next_cursor from the previous page, or None for the first page
+        descending: Newest first when keys start with a timestamp
+        
+    Returns:
+        (rows, next_cursor); next_cursor is None on the last page
+    """
+    supabase_admin = await get_supabase_admin()
+    if not supabase_admin:
+        raise RuntimeError("Admin client not initialized")
+    
+    limit = max(1, min(limit, SUPABASE_MAX_PAGE_SIZE))
+    if columns.strip() != "*":
+        selected = [c.strip() for c in columns.split(",")]
+        columns = ",".join(selected + [k for k in keys if k not in selected])
+    
+    query = supabase_admin.table(table).select(columns)
+    for column, value in (filters or {}).items():
+        query = query.eq(column, value)
+    if cursor:
+        query = query.or_(keyset_filter(keys, decode_cursor(cursor), descending))
+    for key in keys:
+        query = query.order(key, desc=descending)
+    
+    # One extra row tells us whether there is another page
+    response = await query.limit(limit + 1).execute()
+    rows = response.data or []
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({key: rows[-1][key] for key in keys})
+    return rows, next_cursor
+
+
+async def iter_rows(
+    table: str,
+    columns: str,
+    keys: List[str],
+    filters: Optional[Dict[str, Any]] = None,
+    page_size: int = SUPABASE_MAX_PAGE_SIZE
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream every matching row page by page, holding one page in memory at a time"""
+    cursor = None
+    while True:
+        rows, cursor = await select_page(table, columns, keys, filters, page_size, cursor)
+        for row in rows:
+            yield row
+        if cursor is None:
+            return
 
 
 # User Authentication Functions
@@ -39,12 +246,14 @@ async def sign_up(email: str, password: str, user_data: Dict[str, Any] = None) -
     """
     try:
         # Register the user with Supabase Auth
-        auth_response = supabase.auth.sign_up({
+        supabase = await get_supabase()
+        auth_response = await supabase.auth.sign_up({
             "email": email,
             "password": password,
         })
         
         # If registration successful and we have additional user data
+        supabase_admin = await get_supabase_admin()
         if auth_response.user and user_data and supabase_admin:
             user_id = auth_response.user.id
             
@@ -58,7 +267,7 @@ async def sign_up(email: str, password: str, user_data: Dict[str, Any] = None) -
                 "password_hash": "HASHED_IN_SUPABASE"  # Password is handled by Supabase Auth
             }
             
-            supabase_admin.table("users").insert(user_record).execute()
+            await supabase_admin.table("users").insert(user_record).execute()
         
         return {
             "user": auth_response.user.model_dump() if auth_response.user else {},
@@ -80,7 +289,8 @@ async def sign_in(email: str, password: str) -> Dict[str, Any]:
         User data and session
     """
     try:
-        auth_response = supabase.auth.sign_in_with_password({
+        supabase = await get_supabase()
+        auth_response = await supabase.auth.sign_in_with_password({
             "email": email,
             "password": password
         })
@@ -104,11 +314,13 @@ async def sign_out(jwt: str) -> Dict[str, Any]:
         Success message
     """
     try:
-        # Set the auth token for the client
-        supabase.auth.set_session(jwt)
+        supabase_admin = await get_supabase_admin()
+        if not supabase_admin:
+            return {"error": "Admin client not initialized"}
         
-        # Sign out
-        supabase.auth.sign_out()
+        # Revoke only the session the token belongs to (other devices stay signed in),
+        # without touching shared client state
+        await supabase_admin.auth.admin.sign_out(jwt, scope="local")
         
         return {"message": "Successfully signed out"}
     except Exception as e:
@@ -126,20 +338,23 @@ async def get_user(user_id: str) -> Dict[str, Any]:
         User data
     """
     try:
-        if not supabase_admin:
-            return {"error": "Admin client not initialized"}
+        user = await user_loader.load(user_id)
         
-        # Get user from users table
-        response = supabase_admin.table("users").select("*").eq("user_id", user_id).execute()
-        
-        if response.data and len(response.data) > 0:
-            return response.data[0]
+        if user:
+            return user
         
         return {"error": "User not found"}
     except Exception as e:
         return {"error": str(e)}
 
 
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop the user's row from the auth profile cache after it changes"""
+    # Imported here: utils.auth imports this module
+    from utils.auth import invalidate_user_profile
+    invalidate_user_profile(user_id)
+
+
 async def update_user(user_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Update a user's information
@@ -152,12 +367,14 @@ async def update_user(user_id: str, update_data: Dict[str, Any]) -> Dict[str, An
         Updated user data
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
-        response = supabase_admin.table("users").update(update_data).eq("user_id", user_id).execute()
+        response = await supabase_admin.table("users").update(update_data).eq("user_id", user_id).execute()
         
         if response.data and len(response.data) > 0:
+            invalidate_cached_user(user_id)
             return response.data[0]
         
         return {"error": "User not found or update failed"}
@@ -176,11 +393,13 @@ async def delete_user(user_id: str) -> Dict[str, Any]:
         Success message
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
         # First delete from users table (cascade will handle related tables)
-        user_response = supabase_admin.table("users").delete().eq("user_id", user_id).execute()
+        user_response = await supabase_admin.table("users").delete().eq("user_id", user_id).execute()
+        invalidate_cached_user(user_id)
         
         # Then delete from auth.users if needed
         # This requires special admin privileges and might need a different approach
@@ -191,45 +410,71 @@ async def delete_user(user_id: str) -> Dict[str, Any]:
         return {"error": str(e)}
 
 
-async def get_all_users() -> Dict[str, Any]:
+async def get_all_users(
+    limit: int = SUPABASE_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    columns: str = USER_LIST_COLUMNS
+) -> Dict[str, Any]:
     """
-    Get all users
+    Get one page of users, newest first
     
+    Args:
+        limit: Page size
+        cursor: next_cursor from the previous page
+        columns: Columns to return
+        
     Returns:
-        List of user data dictionaries
+        Dict with "users" and "next_cursor" (None on the last page)
     """
     try:
-        if not supabase_admin:
-            return {"error": "Admin client not initialized"}
+        users, next_cursor = await select_page("users", columns, ["created_at", "user_id"], limit=limit, cursor=cursor)
         
-        response = supabase_admin.table("users").select("*").execute()
-        
-        return {"users": response.data}
+        return {"users": users, "next_cursor": next_cursor}
     except Exception as e:
         return {"error": str(e)}
 
 
+async def iter_all_users(columns: str = USER_LIST_COLUMNS) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream every user for admin exports without loading the table into memory
+    
+    Yields:
+        User rows, newest first
+    """
+    async for user in iter_rows("users", columns, ["created_at", "user_id"]):
+        yield user
+
+
 # Profile Functions
-async def create_profile(profile_data: Dict[str, Any]) -> Dict[str, Any]:
+async def create_profile(profile_data: Dict[str, Any], hobbies: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Create a user profile
     
     Args:
         profile_data: Profile data including user_id, name, etc.
+        hobbies: Hobby names to add to the new profile in one bulk insert
         
     Returns:
-        Created profile data
+        Created profile data (with "hobbies" when hobbies were given)
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
-        response = supabase_admin.table("profiles").insert(profile_data).execute()
+        response = await supabase_admin.table("profiles").insert(profile_data).execute()
         
-        if response.data and len(response.data) > 0:
-            return response.data[0]
+        if not response.data:
+            return {"error": "Failed to create profile"}
         
-        return {"error": "Failed to create profile"}
+        profile = response.data[0]
+        if hobbies:
+            result = await add_hobbies(profile["profile_id"], hobbies)
+            if "error" in result:
+                return result
+            profile["hobbies"] = result["hobbies"]
+        
+        return profile
     except Exception as e:
         return {"error": str(e)}
 
@@ -245,10 +490,11 @@ async def get_profile(profile_id: str) -> Dict[str, Any]:
         Profile data
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
-        response = supabase_admin.table("profiles").select("*").eq("profile_id", profile_id).execute()
+        response = await supabase_admin.table("profiles").select("*").eq("profile_id", profile_id).execute()
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -269,13 +515,10 @@ async def get_user_profile(user_id: str) -> Dict[str, Any]:
         Profile data
     """
     try:
-        if not supabase_admin:
-            return {"error": "Admin client not initialized"}
+        profile = await profile_loader.load(user_id)
         
-        response = supabase_admin.table("profiles").select("*").eq("user_id", user_id).execute()
-        
-        if response.data and len(response.data) > 0:
-            return response.data[0]
+        if profile:
+            return profile
         
         return {"error": "Profile not found"}
     except Exception as e:
@@ -294,10 +537,11 @@ async def update_profile(profile_id: str, update_data: Dict[str, Any]) -> Dict[s
         Updated profile data
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
-        response = supabase_admin.table("profiles").update(update_data).eq("profile_id", profile_id).execute()
+        response = await supabase_admin.table("profiles").update(update_data).eq("profile_id", profile_id).execute()
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -319,10 +563,11 @@ async def add_hobby(hobby_data: Dict[str, Any]) -> Dict[str, Any]:
         Created hobby data
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
-        response = supabase_admin.table("hobbies").insert(hobby_data).execute()
+        response = await supabase_admin.table("hobbies").insert(hobby_data).execute()
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -332,6 +577,31 @@ async def add_hobby(hobby_data: Dict[str, Any]) -> Dict[str, Any]:
         return {"error": str(e)}
 
 
+async def add_hobbies(profile_id: str, hobby_names: List[str]) -> Dict[str, Any]:
+    """
+    Add several hobbies to a profile in one request
+    
+    Hobbies the profile already has are skipped.
+    
+    Args:
+        profile_id: Profile ID
+        hobby_names: Hobby names to add
+        
+    Returns:
+        Dict containing the newly added hobbies
+    """
+    try:
+        rows = [{"profile_id": profile_id, "hobby_name": name} for name in dict.fromkeys(hobby_names)]
+        if not rows:
+            return {"hobbies": []}
+        
+        hobbies = await upsert_rows("hobbies", rows, on_conflict="profile_id,hobby_name", ignore_duplicates=True)
+        
+        return {"hobbies": hobbies}
+    except Exception as e:
+        return {"error": str(e)}
+
+
 async def get_profile_hobbies(profile_id: str) -> Dict[str, Any]:
     """
     Get all hobbies for a profile
@@ -343,12 +613,9 @@ async def get_profile_hobbies(profile_id: str) -> Dict[str, Any]:
         List of hobbies
     """
     try:
-        if not supabase_admin:
-            return {"error": "Admin client not initialized"}
+        hobbies = await hobbies_loader.load(profile_id)
         
-        response = supabase_admin.table("hobbies").select("*").eq("profile_id", profile_id).execute()
-        
-        return {"hobbies": response.data}
+        return {"hobbies": hobbies or []}
     except Exception as e:
         return {"error": str(e)}
 
@@ -365,10 +632,11 @@ async def create_relationship(relationship_data: Dict[str, Any]) -> Dict[str, An
         Created relationship data
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
-        response = supabase_admin.table("relationships").insert(relationship_data).execute()
+        response = await supabase_admin.table("relationships").insert(relationship_data).execute()
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -389,12 +657,9 @@ async def get_user_relationships(user_id: str) -> Dict[str, Any]:
         List of relationships
     """
     try:
-        if not supabase_admin:
-            return {"error": "Admin client not initialized"}
+        relationships = await relationships_loader.load(user_id)
         
-        response = supabase_admin.table("relationships").select("*").eq("user_id", user_id).execute()
-        
-        return {"relationships": response.data}
+        return {"relationships": relationships or []}
     except Exception as e:
         return {"error": str(e)}
 
@@ -412,23 +677,11 @@ async def save_user_preferences(user_id: str, preferences: Dict[str, Any]) -> Di
         Saved preferences data
     """
     try:
-        if not supabase_admin:
-            return {"error": "Admin client not initialized"}
-        
-        # Check if preferences already exist
-        check_response = supabase_admin.table("user_preferences").select("preference_id").eq("user_id", user_id).execute()
-        
-        if check_response.data and len(check_response.data) > 0:
-            # Update existing preferences
-            preference_id = check_response.data[0]["preference_id"]
-            response = supabase_admin.table("user_preferences").update(preferences).eq("preference_id", preference_id).execute()
-        else:
-            # Create new preferences
-            preferences["user_id"] = user_id
-            response = supabase_admin.table("user_preferences").insert(preferences).execute()
+        # One round trip; concurrent saves for the same user cannot create duplicates
+        saved = await upsert_rows("user_preferences", [{**preferences, "user_id": user_id}], on_conflict="user_id")
         
-        if response.data and len(response.data) > 0:
-            return response.data[0]
+        if saved:
+            return saved[0]
         
         return {"error": "Failed to save preferences"}
     except Exception as e:
@@ -446,13 +699,10 @@ async def get_user_preferences(user_id: str) -> Dict[str, Any]:
         User preferences
     """
     try:
-        if not supabase_admin:
-            return {"error": "Admin client not initialized"}
-        
-        response = supabase_admin.table("user_preferences").select("*").eq("user_id", user_id).execute()
+        preferences = await preferences_loader.load(user_id)
         
-        if response.data and len(response.data) > 0:
-            return response.data[0]
+        if preferences:
+            return preferences
         
         return {"error": "Preferences not found"}
     except Exception as e:
@@ -471,10 +721,11 @@ async def create_date_plan(date_plan_data: Dict[str, Any]) -> Dict[str, Any]:
         Created date plan data
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
-        response = supabase_admin.table("date_plans").insert(date_plan_data).execute()
+        response = await supabase_admin.table("date_plans").insert(date_plan_data).execute()
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -484,23 +735,31 @@ async def create_date_plan(date_plan_data: Dict[str, Any]) -> Dict[str, Any]:
         return {"error": str(e)}
 
 
-async def get_user_date_plans(user_id: str) -> Dict[str, Any]:
+async def get_user_date_plans(
+    user_id: str,
+    limit: int = SUPABASE_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    columns: str = DATE_PLAN_LIST_COLUMNS
+) -> Dict[str, Any]:
     """
-    Get all date plans for a user
+    Get one page of a user's date plans, newest first
     
     Args:
         user_id: User ID
+        limit: Page size
+        cursor: next_cursor from the previous page
+        columns: Columns to return
         
     Returns:
-        List of date plans
+        Dict with "date_plans" and "next_cursor" (None on the last page)
     """
     try:
-        if not supabase_admin:
-            return {"error": "Admin client not initialized"}
-        
-        response = supabase_admin.table("date_plans").select("*").eq("user_id", user_id).execute()
+        date_plans, next_cursor = await select_page(
+            "date_plans", columns, ["created_at", "date_plan_id"],
+            filters={"user_id": user_id}, limit=limit, cursor=cursor
+        )
         
-        return {"date_plans": response.data}
+        return {"date_plans": date_plans, "next_cursor": next_cursor}
     except Exception as e:
         return {"error": str(e)}
 
@@ -516,10 +775,11 @@ async def get_date_plan(date_plan_id: str) -> Dict[str, Any]:
         Date plan data
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
-        response = supabase_admin.table("date_plans").select("*").eq("date_plan_id", date_plan_id).execute()
+        response = await supabase_admin.table("date_plans").select("*").eq("date_plan_id", date_plan_id).execute()
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -540,10 +800,11 @@ async def add_date_plan_detail(detail_data: Dict[str, Any]) -> Dict[str, Any]:
         Created detail data
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
-        response = supabase_admin.table("date_plan_details").insert(detail_data).execute()
+        response = await supabase_admin.table("date_plan_details").insert(detail_data).execute()
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -566,18 +827,15 @@ async def save_favorite_date(user_id: str, date_plan: Dict[str, Any]) -> Dict[st
         Dict containing success status
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
-        # Add user_id to the date plan
-        date_plan["user_id"] = user_id
-        
-        # Insert the date plan
-        response = supabase_admin.table("favorite_dates").insert(date_plan).execute()
+        # Insert the date plan and get the new row back in the same request
+        response = await supabase_admin.table("favorite_dates").insert({**date_plan, "user_id": user_id}).execute()
         
-        # Check for errors
-        if response.error:
-            return {"error": response.error.message}
+        if not response.data:
+            return {"error": "Failed to save favorite date"}
         
         return {"success": True, "date_id": response.data[0]["id"]}
     except Exception as e:
@@ -596,45 +854,188 @@ async def remove_favorite_date(user_id: str, date_id: int) -> Dict[str, Any]:
         Dict containing success status
     """
     try:
+        supabase_admin = await get_supabase_admin()
         if not supabase_admin:
             return {"error": "Admin client not initialized"}
         
         # Delete the date plan
-        response = supabase_admin.table("favorite_dates").delete().eq("id", date_id).eq("user_id", user_id).execute()
-        
-        # Check for errors
-        if response.error:
-            return {"error": response.error.message}
+        await supabase_admin.table("favorite_dates").delete().eq("id", date_id).eq("user_id", user_id).execute()
         
         return {"success": True}
     except Exception as e:
         return {"error": str(e)}
 
 
-async def get_favorite_dates(user_id: str) -> Dict[str, Any]:
+async def get_favorite_dates(
+    user_id: str,
+    limit: int = SUPABASE_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    columns: str = FAVORITE_DATE_COLUMNS
+) -> Dict[str, Any]:
     """
-    Get all favorite date plans for a user
+    Get one page of a user's favorite date plans, newest first
     
     Args:
         user_id: User's ID
+        limit: Page size
+        cursor: next_cursor from the previous page
+        columns: Columns to return
         
     Returns:
-        Dict containing favorite date plans
+        Dict with "dates" and "next_cursor" (None on the last page)
     """
     try:
-        if not supabase_admin:
-            return {"error": "Admin client not initialized"}
+        dates, next_cursor = await select_page(
+            "favorite_dates", columns, ["id"],
+            filters={"user_id": user_id}, limit=limit, cursor=cursor
+        )
         
-        # Get the favorite date plans
-        response = supabase_admin.table("favorite_dates").select("*").eq("user_id", user_id).execute()
+        return {"dates": dates, "next_cursor": next_cursor}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# Batched Loaders
+# Lookups made in the same event-loop tick, by one request or many, are answered by
+# one `in.(...)` query per table instead of one query per key.
+
+# Users with their profile (and its hobbies), relationships (with the partner's
+# profile) and preferences, in one PostgREST request. profiles is reachable from
+# users both directly and through relationships, so the foreign key is named.
+# The user's own columns are USER_LIST_COLUMNS, so password_hash never leaves the database
+USER_CONTEXT_SELECT = (
+    f"{USER_LIST_COLUMNS}, "
+    "profile:profiles!profiles_user_id_fkey(*, hobbies(*)), "
+    "relationships!relationships_user_id_fkey(*, partner:profiles!relationships_partner_id_fkey(*)), "
+    "preferences:user_preferences(*)"
+)
+
+
+async def select_in(table: str, column: str, keys: List[Any], columns: str = "*") -> List[Dict[str, Any]]:
+    """Rows of table whose column is any of keys, in one round trip"""
+    supabase_admin = await get_supabase_admin()
+    if not supabase_admin:
+        raise RuntimeError("Admin client not initialized")
+    
+    response = await supabase_admin.table(table).select(columns).in_(column, keys).execute()
+    return response.data or []
+
+
+def first_by(rows: List[Dict[str, Any]], column: str) -> Dict[Any, Dict[str, Any]]:
+    """First row per value of column"""
+    result = {}
+    for row in rows:
+        result.setdefault(row[column], row)
+    return result
+
+
+def group_by(rows: List[Dict[str, Any]], column: str) -> Dict[Any, List[Dict[str, Any]]]:
+    """All rows per value of column"""
+    result = {}
+    for row in rows:
+        result.setdefault(row[column], []).append(row)
+    return result
+
+
+async def batch_users(user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    return first_by(await select_in("users", "user_id", user_ids), "user_id")
+
+
+async def batch_user_profiles(user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    return first_by(await select_in("profiles", "user_id", user_ids), "user_id")
+
+
+async def batch_profile_hobbies(profile_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    return group_by(await select_in("hobbies", "profile_id", profile_ids), "profile_id")
+
+
+async def batch_user_relationships(user_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    return group_by(await select_in("relationships", "user_id", user_ids), "user_id")
+
+
+async def batch_user_preferences(user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    return first_by(await select_in("user_preferences", "user_id", user_ids), "user_id")
+
+
+def embedded_one(value: Any) -> Optional[Dict[str, Any]]:
+    """
+    Single embedded row from a PostgREST select
+    
+    A foreign key with a UNIQUE constraint embeds as an object (or null),
+    otherwise as a list, so accept either.
+    """
+    if isinstance(value, dict):
+        return value
+    return value[0] if value else None
+
+
+async def batch_user_contexts(user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    contexts = {}
+    for row in await select_in("users", "user_id", user_ids, USER_CONTEXT_SELECT):
+        user = dict(row)
+        profile = user.pop("profile", None)
+        preferences = user.pop("preferences", None)
+        relationships = user.pop("relationships", None) or []
+        contexts[user["user_id"]] = {
+            "user": user,
+            "profile": embedded_one(profile),
+            "relationships": relationships,
+            "preferences": embedded_one(preferences)
+        }
+    return contexts
+
+
+# Process-wide loaders batch across concurrent requests and never cache
+user_loader = DataLoader(batch_users)
+profile_loader = DataLoader(batch_user_profiles)
+hobbies_loader = DataLoader(batch_profile_hobbies)
+relationships_loader = DataLoader(batch_user_relationships)
+preferences_loader = DataLoader(batch_user_preferences)
+user_context_loader = DataLoader(batch_user_contexts)
+
+
+class RequestLoaders:
+    """
+    Loaders for one request
+
+    Repeated lookups of the same key within the request are answered from
+    memory; new keys are batched with other requests' lookups through the
+    process-wide loaders.
+    """
+
+    def __init__(self):
+        self.users = MemoizedLoader(user_loader)
+        self.profiles = MemoizedLoader(profile_loader)
+        self.hobbies = MemoizedLoader(hobbies_loader)
+        self.relationships = MemoizedLoader(relationships_loader)
+        self.preferences = MemoizedLoader(preferences_loader)
+        self.contexts = MemoizedLoader(user_context_loader)
+
+
+def get_request_loaders() -> RequestLoaders:
+    """FastAPI dependency providing fresh loaders for each request"""
+    return RequestLoaders()
+
+
+async def get_user_context(user_id: str, loaders: Optional[RequestLoaders] = None) -> Dict[str, Any]:
+    """
+    Get everything needed to personalize a plan for a user in one round trip
+    
+    Args:
+        user_id: User's ID
+        loaders: Request-scoped loaders, if the caller has them
         
-        # Check for errors
-        if response.error:
-            return {"error": response.error.message}
+    Returns:
+        Dict with "user", "profile" (including "hobbies"), "relationships"
+        (each with the "partner" profile) and "preferences"
+    """
+    try:
+        loader = loaders.contexts if loaders else user_context_loader
+        context = await loader.load(user_id)
         
-        # Get the date plans
-        data = response.data
+        if context:
+            return context
         
-        return {"dates": data}
+        return {"error": "User not found"}
     except Exception as e:
         return {"error": str(e)}
@@ -1,16 +1,12 @@
-import os
 import httpx
-from dotenv import load_dotenv
+from typing import Optional
+from utils.geocode import geocode
 
-load_dotenv()
-API_KEY = os.getenv("GOOGLE_API_KEY")
-
-def get_weather_and_pollen(location):
+async def get_weather_and_pollen(location, client: Optional[httpx.AsyncClient] = None):
     try:
-        geo_url = "https://maps.googleapis.com/maps/api/geocode/json"
-        params = {"address": location, "key": API_KEY}
-        geo_resp = httpx.get(geo_url, params=params).json()
-        coords = geo_resp["results"][0]["geometry"]["location"]
+        coords = await geocode(location, client)
+        if coords is None:
+            raise ValueError(f"Could not geocode {location}")
         lat, lng = coords["lat"], coords["lng"]
 
         # Simulated weather and pollen summary
@@ -19,4 +15,4 @@ def get_weather_and_pollen(location):
 
         return f"{weather_summary}, {pollen_level} in {location}"
     except Exception as e:
-        return f"Weather and pollen info unavailable for {location}."
\ No newline at end of file
+        return f"Weather and pollen info unavailable for {location}."
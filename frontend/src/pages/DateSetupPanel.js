@@ -25,6 +25,7 @@ const DateSetupPanel = () => {
     transit: dateSetup.transit || []
   });
   const [isLoading, setIsLoading] = useState(false);
+  const [loadingMessage, setLoadingMessage] = useState('FINDING PERFECT SPOTS...');
   const [fadeIn, setFadeIn] = useState(false);
   const [hobbyInput, setHobbyInput] = useState('');
   const [error, setError] = useState('');
@@ -169,6 +170,7 @@ const DateSetupPanel = () => {
 
   const generateDatePlan = async () => {
     setIsLoading(true);
+    setLoadingMessage('FINDING PERFECT SPOTS...');
     setError('');
     playSound('findingSpots');
     
@@ -206,8 +208,10 @@ const DateSetupPanel = () => {
         // Continue with API call even if Supabase save fails
       }
       
-      // Call the backend API
-      const result = await api.datePlanning.generateDatePlan(preferences);
+      // Call the backend API, showing each provider's results as they arrive
+      const result = await api.datePlanning.streamDatePlan(preferences, (event) => {
+        setLoadingMessage(`FOUND ${event.toUpperCase()}...`);
+      });
       console.log("API result:", result);
       
       // Save to context
@@ -303,7 +307,7 @@ const DateSetupPanel = () => {
   if (isLoading) {
     return (
       <RetroHeartBackground heartCount={15}>
-        <LoadingAnimation message="FINDING PERFECT SPOTS..." />
+        <LoadingAnimation message={loadingMessage} />
       </RetroHeartBackground>
     );
   }
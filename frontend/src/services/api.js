@@ -3,6 +3,17 @@
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
 
+// Ensure the preferences match the backend schema
+const toDatePlanRequest = (preferences) => ({
+  location: preferences.location || '',
+  budget: preferences.budget || 'medium',
+  interests: preferences.interests || [],
+  dietary_restrictions: preferences.dietary_restrictions || [],
+  preferences: preferences.preferences || preferences.transportation || [],
+  vibe: preferences.vibe || 'romantic',
+  style_preference: preferences.style_preference || 'casual'
+});
+
 // Actual API service with real backend connections
 const api = {
   // Auth endpoints
@@ -133,16 +144,7 @@ const api = {
     // Generate date plan based on preferences
     generateDatePlan: async (preferences) => {
       try {
-        // Ensure the preferences match the backend schema
-        const requestData = {
-          location: preferences.location || '',
-          budget: preferences.budget || 'medium',
-          interests: preferences.interests || [],
-          dietary_restrictions: preferences.dietary_restrictions || [],
-          preferences: preferences.preferences || preferences.transportation || [],
-          vibe: preferences.vibe || 'romantic',
-          style_preference: preferences.style_preference || 'casual'
-        };
+        const requestData = toDatePlanRequest(preferences);
         
         console.log('Sending to backend:', requestData);
         
@@ -186,6 +188,68 @@ const api = {
       }
     },
     
+    // Stream a date plan as each provider answers.
+    // onPartial(event, payload) receives "restaurants", "activities" and "events"
+    // as they arrive; the promise resolves with the complete plan. Any streaming
+    // failure falls back to the non-streaming endpoint.
+    streamDatePlan: async (preferences, onPartial = () => {}) => {
+      try {
+        const response = await fetch(`${API_BASE_URL}/generate-date/stream`, {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream',
+          },
+          body: JSON.stringify(toDatePlanRequest(preferences)),
+        });
+
+        if (!response.ok || !response.body) {
+          throw new Error(`API error: ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let plan = null;
+
+        while (true) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+
+          // Server-Sent Events are separated by a blank line
+          let boundary;
+          while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            rawEvent.split('\n').forEach(line => {
+              if (line.startsWith('event:')) event = line.slice(6).trim();
+              else if (line.startsWith('data:')) data += line.slice(5).trim();
+            });
+            if (!data) continue;
+
+            const payload = JSON.parse(data);
+            if (event === 'plan') {
+              plan = payload;
+            } else {
+              onPartial(event, payload);
+            }
+          }
+        }
+
+        if (!plan) {
+          throw new Error('Stream ended without a plan');
+        }
+        return plan;
+      } catch (error) {
+        console.error('Error streaming date plan, falling back:', error);
+        return api.datePlanning.generateDatePlan(preferences);
+      }
+    },
+    
     // Save a completed date plan
     saveDatePlan: async (datePlan, token) => {
       try {